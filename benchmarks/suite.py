@@ -0,0 +1,199 @@
+import os, sys, json, time, shutil, argparse, platform, subprocess, tempfile, tracemalloc
+import numpy as np
+import pandas as pd
+from core.indicator import Indicator, IndicatorStore
+from core.backtester import Backtester
+from core.optimizer import Optimizer
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+# indicators benchmarked (ind_t, parameters)
+INDICATORS = [
+    ("SMA", [20]),
+    ("SMA", [20, 50]),
+    ("SMA", [10, 20, 50]),
+    ("EMA", [20, 50]),
+    ("WMA", [20, 50]),
+    ("BB", [20, 2]),
+    ("MACD", [12, 26, 9]),
+]
+
+# search spaces of the evaluate/search benchmarks
+SPACES = {
+    "SMA": {"ind_t": "SMA", "params": [{"min": 5, "max": 30}, {"min": 40, "max": 120}]},
+    "BB": {"ind_t": "BB", "params": [{"min": 10, "max": 40}, {"min": 1, "max": 3}]},
+    "MACD": {"ind_t": "MACD", "params": [{"min": 5, "max": 20}, {"min": 20, "max": 60}, {"min": 5, "max": 15}]},
+}
+
+ALGORITHMS = ["simulated_annealing", "hill_climbing", "genetic_algorithm", "grid_search"]
+
+
+def config_file(folder, **override):
+    # benchmark config (repo config without result store/checkpoints, given overrides)
+    with open("config/config.json", "r", encoding="utf-8") as f: config = json.load(f)
+    config.update({"result_store": "", "checkpoint_every": 0})
+    for name in ALGORITHMS: config[name] = {**config.get(name, {}), "enabled": False}
+    config.update(override)
+    path = os.path.join(folder, "config.json")
+    with open(path, "w", encoding="utf-8") as f: json.dump(config, f)
+    return path
+
+
+def candidates(space, n, seed=0):
+    # n random parameter vectors of a search space
+    rng    = np.random.default_rng(seed)
+    params = np.column_stack([rng.integers(p["min"], p["max"] +1, n) for p in space["params"]])
+    if space["ind_t"] == "MACD": params[:, 0] = np.minimum(params[:, 0], params[:, 1] -1)
+    return params.tolist()
+
+
+# =====================================================
+#  Cases
+# =====================================================
+def indicator_cases(df, folder):
+    for ind_t, params in INDICATORS:
+        indicator = {"ind_t": ind_t, "ind_p": params}
+        yield f"indicator/{ind_t}{len(params)}", 1e7, lambda x=indicator: Indicator(x).setup_indicator(df.copy())
+
+
+def backtest_cases(df, folder):
+    for ind_t, params in INDICATORS:
+        indicator = {"ind_t": ind_t, "ind_p": params}
+        prepared  = Indicator(indicator).setup_indicator(df.copy())
+        yield f"run_strategy/{ind_t}{len(params)}", 1e7, lambda x=indicator, d=prepared: Backtester(d).run_strategy(x)
+    for ind_t, space in SPACES.items():
+        params = candidates(space, 16)
+        yield f"run_batch/{ind_t}x16", 1e6, lambda t=ind_t, p=params: Backtester.run_batch(df["Close"], df["Volume"], t, p, IndicatorStore())
+
+
+def evaluate_cases(df, folder):
+    for lean in [False, True]:
+        path = config_file(folder, lean=lean, sweep=False)
+        for ind_t, space in SPACES.items():
+            params = candidates(space, 20)
+            def run(space=space, params=params, path=path):
+                optimization = Optimizer(df, space, path)
+                for p in params: optimization.evaluate({"ind_t": space["ind_t"], "ind_p": p})
+            yield f"evaluate/{'lean' if lean else 'full'}/{ind_t}x20", 1e6 if lean else 1e5, run
+
+
+def search_cases(df, folder):
+    for name in ALGORITHMS:
+        cfg  = {"enabled": True, "alpha": 2, "batch_size": 64} if name == "grid_search" else {"enabled": True, "alpha": 1, "n": 3, "k_max": 20}
+        path = config_file(folder, **{name: cfg})
+        for ind_t, space in SPACES.items():
+            if name == "grid_search" and ind_t == "MACD": continue   # grid of ~1k candidates
+            yield f"search/{name}/{ind_t}", 1e5, lambda space=space, path=path: Optimizer(df, space, path).search()
+
+
+GROUPS = {"indicator": indicator_cases, "backtest": backtest_cases, "evaluate": evaluate_cases, "search": search_cases}
+
+
+# =====================================================
+#  Benchmark
+# =====================================================
+def measure(fn, repeat=3, memory=True):
+    """
+    Times fn (min and median of repeat runs) and measures its peak memory
+    (traced separately, so timings do not include tracing overhead)
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() -t0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]/1024**2
+        tracemalloc.stop()
+    return {"seconds_min": min(times), "seconds_median": float(np.median(times)), "repeat": repeat, "peak_mb": peak}
+
+
+def metadata(seed):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "seed": seed,
+    }
+
+
+def run(sizes, groups=tuple(GROUPS), select="", repeat=3, memory=True, seed=0):
+    """
+    Runs every benchmark case up to its bar limit
+    returns:
+    - dictionary with run metadata and one result row per (case, n_bars)
+    """
+    results = []
+    cwd     = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        # cases run inside folder (search logs are written to data/results, scores read config/config.json)
+        os.makedirs(os.path.join(folder, "data", "results"))
+        os.makedirs(os.path.join(folder, "config"))
+        shutil.copy(os.path.join("config", "config.json"), os.path.join(folder, "config"))
+        for n_bars in sizes:
+            df = synthetic_ohlcv(n_bars, seed)
+            for group in groups:
+                for name, max_bars, fn in GROUPS[group](df, folder):
+                    if n_bars > max_bars or select not in name: continue
+                    os.chdir(folder)
+                    try:
+                        row = {"name": name, "n_bars": n_bars, **measure(fn, repeat, memory)}
+                    finally:
+                        os.chdir(cwd)
+                    results.append(row)
+                    peak = f"{row['peak_mb']:10.1f}" if memory else f"{'-':>10}"
+                    print(f"{name:<36} {n_bars:>10} {row['seconds_min']:>12.4f} {peak}", flush=True)
+    return {"meta": metadata(seed), "results": results}
+
+
+def compare(base, new):
+    # prints time/memory ratios new/base of the rows present in both files
+    rows = {(r["name"], r["n_bars"]): r for r in base["results"]}
+    print(f"{'name':<36} {'bars':>10} {'base [s]':>10} {'new [s]':>10} {'ratio':>7} {'mem ratio':>10}")
+    for r in new["results"]:
+        b = rows.get((r["name"], r["n_bars"]))
+        if b is None: continue
+        mem = f"{r['peak_mb']/b['peak_mb']:>10.2f}" if r["peak_mb"] and b["peak_mb"] else f"{'-':>10}"
+        print(f"{r['name']:<36} {r['n_bars']:>10} {b['seconds_min']:>10.4f} {r['seconds_min']:>10.4f} {r['seconds_min']/b['seconds_min']:>7.2f} {mem}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of indicators, backtests and searches on synthetic data.")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma separated bar counts")
+    parser.add_argument("--full", action="store_true", help="also run 10M bars")
+    parser.add_argument("--groups", default=",".join(GROUPS), help="comma separated groups")
+    parser.add_argument("--select", default="", help="only cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output file (default benchmarks/results/{commit}.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g: compare(json.load(f), json.load(g))
+        return
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")] +([10_000_000] if args.full else [])
+    print(f"{'name':<36} {'bars':>10} {'time [s]':>12} {'peak [MB]':>10}")
+    report = run(sizes, args.groups.split(","), args.select, args.repeat, not args.no_memory, args.seed)
+
+    out = args.out or os.path.join("benchmarks", "results", f"{report['meta']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f: json.dump(report, f, indent=4)
+    print(f"Results written to {out}.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
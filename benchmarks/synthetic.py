@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+#  Synthetic data
+# =====================================================
+def synthetic_ohlcv(n_bars, seed=0, start="2000-01-03", price=100.0, vol=0.02):
+    """
+    Deterministic Close/Volume dataframe (geometric random walk), no download needed
+    """
+    rng    = np.random.default_rng(seed)
+    close  = price*np.exp(np.cumsum(rng.normal(0, vol, n_bars)))
+    volume = rng.integers(100_000, 1_000_000, n_bars).astype(float)
+    index  = pd.date_range(start, periods=n_bars, freq="min" if n_bars > 100_000 else "B")
+    return pd.DataFrame({"Close": close, "Volume": volume}, index=index)
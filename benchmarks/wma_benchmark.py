@@ -0,0 +1,35 @@
+import time
+import numpy as np
+import pandas as pd
+from core.indicator import Indicator
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def wma_rolling_apply(series, window):
+    # previous implementation (Python lambda called once per bar)
+    w = pd.Series(range(1, window+1), dtype=float)
+    return series.rolling(window=window).apply(lambda x: (x*w).sum()/w.sum(), raw=True)
+
+
+def timeit(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0   = time.perf_counter()
+        out  = fn(*args)
+        best = min(best, time.perf_counter() -t0)
+    return best, out
+
+
+def main(sizes=(1_000, 10_000, 100_000), windows=(10, 50)):
+    print(f"{'bars':>10} {'window':>7} {'rolling.apply [s]':>18} {'running sums [s]':>17} {'speedup':>9} {'max rel err':>12}")
+    for n_bars in sizes:
+        close = synthetic_ohlcv(n_bars)["Close"]
+        for window in windows:
+            t_old, old = timeit(wma_rolling_apply, close, window, repeat=1)
+            t_new, new = timeit(Indicator.wma, close, window)
+            err = np.nanmax(np.abs(new -old)/np.abs(old))
+            print(f"{n_bars:>10} {window:>7} {t_old:>18.4f} {t_new:>17.4f} {t_old/t_new:>8.0f}x {err:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
-import json
+import numpy as np
+import pandas as pd
+from .indicator import Indicator
+from .profiler import PROFILER
 
 
 # =====================================================
 #  Backtester
 # =====================================================
 class Backtester:
+    VERSION = 1     # increment whenever backtest logic changes (invalidates stored results)
+    ARRAYS  = 10    # (n_bars, N) float arrays alive at once in a metrics-only batch (indicators included)
+
     def __init__(self, df):
-        self.df = df.copy()
+        self.df = df.copy(deep=False)     # new columns only, prices are not copied (copy-on-write)
 
+    @PROFILER.timed("backtest")
     def run_strategy(self, indicator):
         try:
             df     = self.df
@@ -27,8 +34,8 @@ class Backtester:
                     df.loc[df["Short"] < df["Long"], "Signal"] = -1         
                 elif len(params) == 3:
                     # 3 MAs crossover
-                    df.loc[(df["Short"] > df["Med"]) & (df["Med"] > df["Long"]), "Signal"] = 1
-                    df.loc[(df["Short"] < df["Med"]) & (df["Med"] < df["Long"]), "Signal"] = -1
+                    df.loc[(df["Short"] > df["Mid"]) & (df["Mid"] > df["Long"]), "Signal"] = 1
+                    df.loc[(df["Short"] < df["Mid"]) & (df["Mid"] < df["Long"]), "Signal"] = -1
             elif ind_t == "BB":
                 df.loc[df["Close"] < df["BB_Lower"], "Signal"] = 1          # buy signal (BB)
                 df.loc[df["Close"] > df["BB_Upper"], "Signal"] = -1         # seel signal (BB)
@@ -66,4 +73,212 @@ class Backtester:
             raise RuntimeError("Division by zero in backtest calculations.") from err
         except Exception as err:
             raise RuntimeError(f"Error in backtest run_strategy: {err}") from err
-        return df
\ No newline at end of file
+        return df
+
+    @staticmethod
+    def signals(ind_t, price, cols, n_params):
+        """
+        Vectorized buy/sell signals (1, -1 or 0) from indicator arrays of any shape
+        broadcastable with price (n_bars, N)
+        """
+        if ind_t in ["SMA", "EMA", "WMA"]:
+            if n_params == 1:
+                buy  = price > cols["Short"]
+                sell = price < cols["Short"]
+            elif n_params == 2:
+                buy  = cols["Short"] > cols["Long"]
+                sell = cols["Short"] < cols["Long"]
+            elif n_params == 3:
+                buy  = (cols["Short"] > cols["Mid"]) & (cols["Mid"] > cols["Long"])
+                sell = (cols["Short"] < cols["Mid"]) & (cols["Mid"] < cols["Long"])
+        elif ind_t == "BB":
+            buy  = price < cols["BB_Lower"]
+            sell = price > cols["BB_Upper"]
+        elif ind_t == "MACD":
+            buy  = cols["MACD"] > cols["MACD_Signal"]
+            sell = cols["MACD"] < cols["MACD_Signal"]
+        signal = np.zeros(np.broadcast(price, buy).shape)
+        signal[buy]  = 1
+        signal[sell] = -1
+        return signal
+
+    @staticmethod
+    @PROFILER.timed("backtest")
+    def run_batch(close, volume, ind_t, param_matrix, store=None, ticker=None, bars=None, full=True, max_bytes=None):
+        """
+        Runs the backtest for N parameter vectors in one vectorized pass
+        parameters:
+        - close, volume: series (or arrays) with n_bars samples
+        - ind_t: str with indicator name
+        - param_matrix: array (N, n_params) with one parameter vector per row
+        - store, ticker: indicator store shared across candidates (optional)
+        - bars: slice of bars to backtest, indicators are computed over the whole
+          history first (warm start, shared by every slice)
+        - full: also return the (n_bars, N) diagnostic arrays (metrics only otherwise)
+        - max_bytes: metrics only, candidates are run in chunks of at most
+          max_bytes of (len(close), N) arrays (indicators span the whole history)
+        returns:
+        - dictionary of (n_bars, N) arrays (empty when not full) and dictionary of (N,) metric arrays
+        """
+        params = np.atleast_2d(np.asarray(param_matrix))
+        if not full and max_bytes:
+            n      = max(1, int(max_bytes//(8*Backtester.ARRAYS*max(len(close), 1))))
+            if len(params) > n:
+                parts = [Backtester.run_batch(close, volume, ind_t, params[i:i +n], store, ticker, bars, full=False)[1] for i in range(0, len(params), n)]
+                return {}, {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        try:
+            close  = np.asarray(close, dtype=float)
+            volume = np.asarray(volume, dtype=float)
+            cols   = Indicator.setup_batch(close, ind_t, params, store, ticker)
+            if bars is not None:
+                close  = close[bars]
+                volume = volume[bars]
+                cols   = {name: values[bars] for name, values in cols.items()}
+            price  = close[:, None]
+            
+            # generate buy/sell signals
+            signal = Backtester.signals(ind_t, price, cols, params.shape[1])
+            if not full: return {}, Backtester.batch_metrics(close, signal, len(params))
+            volume_ma = pd.Series(volume).rolling(window=10).mean().to_numpy()
+
+            # simulate execution (backtest)
+            position = np.full_like(signal, np.nan)
+            position[1:] = signal[:-1]                                  # simulate position (using previous sample)
+            position[position == -1] = 0
+            trade    = np.full_like(signal, np.nan)
+            trade[1:]    = np.diff(position, axis=0)                    # simulate trade
+            ret      = np.full_like(close, np.nan)
+            ret[1:]      = close[1:]/close[:-1] -1                      # asset percentage variation
+            strategy = position*ret[:, None]                            # return of the strategy
+            strategy[np.isnan(strategy)] = 0.00001
+            strategy = np.asfortranarray(strategy)
+
+            # compare benchmark vs current strategy
+            cum_market   = np.nancumprod(1 +ret)
+            cum_market[0]  = np.nan
+            cum_strategy = np.cumprod(1 +strategy, axis=0)
+            cum_trades   = np.cumsum(trade == 1, axis=0)
+
+            # calculate drawdown
+            peak     = np.maximum.accumulate(cum_strategy, axis=0)
+            drawdown = (cum_strategy -peak)/peak
+
+            arrays = {
+                "Signal": signal,
+                "Volume_MA": volume_ma,
+                "Volume_Strength": (volume -volume_ma)/volume_ma,
+                "Position": position,
+                "Trade": trade,
+                "Return": ret,
+                "Strategy": strategy,
+                "Cumulative_Market": cum_market,
+                "Cumulative_Strategy": cum_strategy,
+                "Cumulative_Trades": cum_trades,
+                "Drawdown": drawdown,
+                **cols,
+            }
+            metrics = {
+                "Return_Market": np.full(len(params), cum_market[-1]),
+                "Return_Strategy": cum_strategy[-1],
+                "Trades": cum_trades[-1],
+                "Sharpe": strategy.mean(axis=0)/strategy.std(axis=0, ddof=1)*pow(len(close), 0.5),
+                "Max_Drawdown": np.abs(drawdown.min(axis=0)),
+            }
+
+        except KeyError as err:
+            raise KeyError(f"Required column missing in backtest: {err}")
+        except Exception as err:
+            raise RuntimeError(f"Error in backtest run_batch: {err}") from err
+        return arrays, metrics
+
+    @staticmethod
+    def batch_metrics(close, signal, n):
+        """
+        Metrics of run_batch from the signals only, each intermediate (n_bars, N)
+        array is released as soon as the next one is built
+        """
+        position = np.full_like(signal, np.nan)
+        position[1:] = signal[:-1]                                      # simulate position (using previous sample)
+        position[position == -1] = 0
+        del signal
+        trades   = np.count_nonzero(np.diff(position, axis=0) == 1, axis=0)
+        ret      = np.full_like(close, np.nan)
+        ret[1:]      = close[1:]/close[:-1] -1                          # asset percentage variation
+        strategy = np.asfortranarray(position*ret[:, None])             # return of the strategy
+        del position
+        strategy[np.isnan(strategy)] = 0.00001
+        sharpe   = strategy.mean(axis=0)/strategy.std(axis=0, ddof=1)*pow(len(close), 0.5)
+        cum_strategy = np.cumprod(1 +strategy, axis=0)
+        del strategy
+        peak     = np.maximum.accumulate(cum_strategy, axis=0)
+        drawdown = cum_strategy -peak
+        drawdown /= peak
+        cum_market = np.nancumprod(1 +ret)
+        return {
+            "Return_Market": np.full(n, cum_market[-1]),
+            "Return_Strategy": cum_strategy[-1].copy(),     # not a view, chunks are released
+            "Trades": trades,
+            "Sharpe": sharpe,
+            "Max_Drawdown": np.abs(drawdown.min(axis=0)),
+        }
+
+    @staticmethod
+    @PROFILER.timed("backtest")
+    def run_panel(close, lengths, ind_t, params, store=None):
+        """
+        Runs the backtest of one parameter vector on every ticker of a panel in one
+        vectorized pass (same rules as run_strategy on each ticker alone)
+        parameters:
+        - close: array (n_bars, n_tickers), each column holds the bars of one ticker
+          followed by NaN padding (see Panel)
+        - lengths: array (n_tickers,) with the number of bars of each ticker
+        - ind_t: str with indicator name
+        - params: list with one parameter vector
+        - store: indicator store shared across candidates (optional)
+        returns:
+        - dictionary of (n_tickers,) metric arrays
+        """
+        try:
+            close   = np.asarray(close, dtype=float)
+            lengths = np.asarray(lengths)
+            cols    = Indicator.setup_panel(close, ind_t, params, store)
+            valid   = np.arange(len(close))[:, None] < lengths     # bars of each ticker
+            last    = (np.maximum(lengths, 1) -1, np.arange(close.shape[1]))
+
+            # generate buy/sell signals
+            signal = Backtester.signals(ind_t, close, cols, len(params))
+
+            # simulate execution (backtest)
+            position = np.full_like(signal, np.nan)
+            position[1:] = signal[:-1]                                  # simulate position (using previous sample)
+            position[position == -1] = 0
+            trade    = np.full_like(signal, np.nan)
+            trade[1:]    = np.diff(position, axis=0)                    # simulate trade
+            ret      = np.full_like(close, np.nan)
+            ret[1:]      = close[1:]/close[:-1] -1                      # asset percentage variation
+            strategy = position*ret                                     # return of the strategy
+            strategy[np.isnan(strategy)] = 0.00001
+            strategy[~valid] = np.nan                                   # padding is not traded
+
+            # compare benchmark vs current strategy
+            cum_market   = np.nancumprod(1 +ret, axis=0)
+            cum_strategy = np.cumprod(1 +strategy, axis=0)
+            cum_trades   = np.cumsum(trade == 1, axis=0)
+
+            # calculate drawdown
+            peak     = np.fmax.accumulate(cum_strategy, axis=0)
+            drawdown = (cum_strategy -peak)/peak
+
+            metrics = {
+                "Return_Market": np.where(lengths > 1, cum_market[last], np.nan),
+                "Return_Strategy": cum_strategy[last],
+                "Trades": cum_trades[last],
+                "Sharpe": np.nanmean(strategy, axis=0)/np.nanstd(strategy, axis=0, ddof=1)*np.sqrt(lengths),
+                "Max_Drawdown": np.abs(np.nanmin(drawdown, axis=0)),
+            }
+
+        except KeyError as err:
+            raise KeyError(f"Required column missing in backtest: {err}")
+        except Exception as err:
+            raise RuntimeError(f"Error in backtest run_panel: {err}") from err
+        return metrics
@@ -0,0 +1,80 @@
+import heapq
+from collections import OrderedDict
+
+
+# =====================================================
+#  Evaluation Cache
+# =====================================================
+class EvaluationCache:
+    """
+    Keeps score and metrics of every evaluated candidate, but only a bounded
+    number of dataframes (LRU eviction, the keep_top best scored are never evicted)
+    parameters:
+    - max_frames: maximum number of cached dataframes (None for unbounded)
+    - max_bytes: maximum memory of cached dataframes (None for unbounded)
+    - keep_top: number of best scored dataframes protected from eviction
+    """
+    def __init__(self, max_frames=None, max_bytes=None, keep_top=10):
+        self.max_frames = max_frames
+        self.max_bytes  = max_bytes
+        self.keep_top   = keep_top
+        self.entries    = {}              # key -> step {"indicator", "df", "metrics", "score"}
+        self.frames     = OrderedDict()   # key -> dataframe bytes (least recently used first)
+        self.nbytes     = 0
+        self.hits       = 0
+        self.misses     = 0
+        self.evictions  = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, key):
+        step = self.entries[key]
+        if key in self.frames: self.frames.move_to_end(key)
+        return step["score"], step["df"], step["metrics"]
+
+    def get(self, key):
+        # lookup counting hits and misses
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self[key]
+
+    def put(self, key, step):
+        self.entries[key] = step
+        if step["df"] is not None:
+            self.frames[key] = int(step["df"].memory_usage(index=True).sum())
+            self.nbytes     += self.frames[key]
+            self.evict()
+
+    def over_budget(self):
+        return ((self.max_frames is not None and len(self.frames) > self.max_frames) or
+                (self.max_bytes is not None and self.nbytes > self.max_bytes))
+
+    def evict(self):
+        if not self.over_budget(): return
+        top = set(heapq.nlargest(self.keep_top, self.frames, key=lambda key: self.entries[key]["score"]))
+
+        for key in list(self.frames):
+            if not self.over_budget(): break
+            if key in top: continue
+            # drop dataframe, keep score and metrics
+            self.nbytes -= self.frames.pop(key)
+            self.entries[key]["df"] = None
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits +self.misses
+        return {
+            "entries": len(self.entries),
+            "frames": len(self.frames),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits/lookups if lookups else 0.0,
+        }
@@ -0,0 +1,53 @@
+import os, pickle
+
+
+# =====================================================
+#  Checkpoint
+# =====================================================
+class Checkpoint:
+    """
+    Pickled optimizer state, one file per (ticker, indicator) search. Evaluated
+    steps go to an append-only log next to it, so each save writes only the
+    steps added since the previous one.
+    """
+    def __init__(self, folder="data/checkpoints"):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.folder, f"{name}.pkl")
+
+    def log_path(self, name):
+        return os.path.join(self.folder, f"{name}.log")
+
+    def save(self, name, state, records=(), append=True):
+        """
+        parameters:
+        - state: picklable state (rewritten every time)
+        - records: new steps, appended to the log (the log restarts when append is False)
+        """
+        # log first, then the state with the log size (a crash in between leaves records that load ignores)
+        with open(self.log_path(name), "ab" if append else "wb") as f:
+            if records: pickle.dump(list(records), f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+
+        # write to a temporary file first, so a crash never leaves a truncated checkpoint
+        tmp = self.path(name) +".tmp"
+        with open(tmp, "wb") as f: pickle.dump({**state, "log_size": size}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path(name))
+
+    def load(self, name):
+        # state with the logged steps as "data" (the log is truncated to the size the state was saved with)
+        try:
+            with open(self.path(name), "rb") as f: state = pickle.load(f)
+            data = []
+            with open(self.log_path(name), "r+b") as f:
+                while f.tell() < state["log_size"]: data.extend(pickle.load(f))
+                f.truncate(state["log_size"])
+            return {**state, "data": data}
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            return None
+
+    def clear(self):
+        for file in os.listdir(self.folder):
+            if file.endswith((".pkl", ".tmp", ".log")): os.remove(os.path.join(self.folder, file))
@@ -0,0 +1,137 @@
+import json
+from dataclasses import dataclass
+
+
+# score weights of each preset ("custom" takes the config weights)
+PRESETS = {
+    "basic":     {"w_return": 1.0, "w_trades": 0.02, "w_sharpe": 0, "w_drdown": 0},
+    "balanced":  {"w_return": 1.0, "w_trades": 0.04, "w_sharpe": 0.01, "w_drdown": 0.05},
+    "agressive": {"w_return": 1.0, "w_trades": 0, "w_sharpe": 0.02, "w_drdown": 0},
+    "defensive": {"w_return": 1.0, "w_trades": 0.05, "w_sharpe": 0, "w_drdown": 0.05},
+    "custom":    {}
+}
+
+# sections that must be objects (read with config.get(name, {}))
+SECTIONS = [
+    "trace", "profile", "plot", "export", "cache", "weights", "simulated_annealing", "hill_climbing", "genetic_algorithm",
+    "grid_search", "bayesian_optimization", "successive_halving", "walk_forward", "panel", "streaming",
+]
+
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary of a run configuration section (picklable, so the
+    configuration can be sent to worker processes)
+    """
+    def readonly(self, *args, **kwargs):
+        raise TypeError("The run configuration is read-only.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    # read-only copy of parsed JSON (objects -> FrozenDict, arrays -> tuples)
+    if isinstance(value, dict): return FrozenDict({key: freeze(v) for key, v in value.items()})
+    if isinstance(value, (list, tuple)): return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    # mutable copy of a frozen value (objects -> dict, arrays -> lists)
+    if isinstance(value, dict): return {key: thaw(v) for key, v in value.items()}
+    if isinstance(value, tuple): return [thaw(v) for v in value]
+    return value
+
+
+# =====================================================
+#  Run Config
+# =====================================================
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    Validated, immutable configuration of a run: config.json is parsed once and
+    the same object is passed to every component (and job), so editing the file
+    during a run has no effect until the next one
+    parameters:
+    - path: source file
+    - sections: whole configuration (read-only)
+    - weights: score weights of the active preset (w_return, w_trades, w_sharpe, w_drdown)
+    """
+    path: str
+    sections: FrozenDict
+    weights: FrozenDict
+    preset: str = "basic"
+    workers: int = 1
+    top_n: int = 10
+    lean: bool = False
+    sweep: bool = False
+    checkpoint_every: int = 0
+    result_store: str = ""
+
+    @classmethod
+    def load(cls, source="config/config.json"):
+        """
+        parameters:
+        - source: path of a config.json (or a RunConfig, returned as is)
+        """
+        if isinstance(source, RunConfig): return source
+        with open(source, "r", encoding="utf-8") as f: config = json.load(f)
+        return cls.parse(config, source)
+
+    @classmethod
+    def parse(cls, config, path=""):
+        errors = cls.validate(config)
+        if errors: raise ValueError(f"Invalid configuration {path}: {'; '.join(errors)}.")
+        preset = config.get("preset", "basic")
+        return cls(
+            path             = path,
+            sections         = freeze(config),
+            weights          = freeze({**PRESETS[preset], **(config.get("weights", {}) if preset == "custom" else {})}),
+            preset           = preset,
+            workers          = config.get("workers", 1),
+            top_n            = config.get("top_n", 10),
+            lean             = config.get("lean", False),
+            sweep            = config.get("sweep", False),
+            checkpoint_every = config.get("checkpoint_every", 0),
+            result_store     = config.get("result_store", ""),
+        )
+
+    @staticmethod
+    def validate(config):
+        # list of errors (empty when the configuration is valid)
+        errors = []
+        types  = {"workers": int, "top_n": int, "batch_mb": int, "checkpoint_every": int, "lean": bool, "sweep": bool, "preset": str, "result_store": str, "start": str, "market": str}
+        for key, kind in types.items():
+            value = config.get(key)
+            if value is None: continue
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)): errors.append(f"{key} must be {kind.__name__}")
+            elif kind is int and value < (0 if key == "checkpoint_every" else 1): errors.append(f"{key} out of range")
+
+        for name in SECTIONS:
+            if not isinstance(config.get(name, {}), dict): errors.append(f"{name} must be an object")
+            elif not isinstance(config.get(name, {}).get("enabled", False), bool): errors.append(f"{name}.enabled must be bool")
+
+        preset = config.get("preset", "basic")
+        if preset not in PRESETS:
+            errors.append(f"unknown preset {preset}")
+        elif isinstance(config.get("weights", {}), dict):
+            weights = {**PRESETS[preset], **(config.get("weights", {}) if preset == "custom" else {})}
+            for w in PRESETS["basic"]:
+                if not isinstance(weights.get(w), (int, float)) or isinstance(weights.get(w), bool): errors.append(f"weight {w} must be a number")
+
+        for space in config.get("optimize", []):
+            params = space.get("params", []) if isinstance(space, dict) else None
+            if not isinstance(space, dict) or "ind_t" not in space or not isinstance(params, list):
+                errors.append("optimize entries need ind_t and params")
+            elif not all(isinstance(p, dict) and isinstance(p.get("min"), int) and isinstance(p.get("max"), int) and p["min"] <= p["max"] for p in params):
+                errors.append(f"optimize {space['ind_t']}: params need integer min <= max")
+        return errors
+
+    def get(self, key, default=None):
+        return self.sections.get(key, default)
+
+    def __getitem__(self, key):
+        return self.sections[key]
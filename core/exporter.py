@@ -1,6 +1,9 @@
-import json
+import os, shutil
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from .strategies import Strategies
+from .config import RunConfig
 
 
 # =====================================================
@@ -11,9 +14,13 @@ class Exporter:
         self.load_config(file_config)
 
     def load_config(self, path):
-        with open(path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            self.end = config.get("end", datetime.now())
+        config = RunConfig.load(path)
+        self.end = config.get("end", datetime.now())
+        export_cfg       = config.get("export", {})
+        self.format      = export_cfg.get("format", "npy")           # npy, npz, parquet or feather
+        self.compression = export_cfg.get("compression") or None     # npz: any value, parquet/feather: codec name
+        self.top_n       = export_cfg.get("top_n", 0)                # frames kept per ticker (0 keeps all)
+        self.xlsx        = export_cfg.get("xlsx", False)             # also write the selected frames to .xlsx
             
     def round_dataframe(self, df, n=4):
         df = df.copy()
@@ -21,15 +28,76 @@ class Exporter:
         df[float_cols] = df[float_cols].round(n)
         return df 
         
-    def export_dataframe(self, pro_data):
-        # export dataframe for further analysis
+    def select_frames(self, ticker_debug, ranking=None):
+        # keep the top_n frames (ranking: labels sorted by score)
+        labels = [label for label in ranking if label in ticker_debug] if ranking is not None else list(ticker_debug)
+        return {label: ticker_debug[label] for label in (labels[:self.top_n] if self.top_n else labels)}
+
+    def frame_path(self, folder, ticker, label):
+        return os.path.join(folder, ticker, f"{label}.{self.format}")
+
+    def write_frame(self, df, path):
+        if self.format in ["npy", "npz"]:
+            data = df.to_records(index=True)
+            if self.format == "npy": np.save(path, data)
+            elif self.compression: np.savez_compressed(path, data=data)
+            else: np.savez(path, data=data)
+        elif self.format == "parquet":
+            df.to_parquet(path, compression=self.compression)
+        elif self.format == "feather":
+            df.reset_index().to_feather(path, compression=self.compression or "uncompressed")
+        else:
+            raise ValueError(f"Unsupported export format: {self.format}.")
+
+    def export_dataframe(self, pro_data, bst_data=None, folder="data/debug"):
+        """
+        Exports processed dataframes for further analysis, one file per frame
+        in {folder}/{ticker}/ (top_n frames of each ticker when bst_data is given).
+        Frames of a previous run of the ticker are removed first.
+        """
         for ticker, ticker_debug in pro_data.items():
-            with pd.ExcelWriter(f"data/debug/{ticker}.xlsx", engine="openpyxl") as writer:
-                for sheet_name, df in ticker_debug.items():
+            frames = self.select_frames(ticker_debug, bst_data[ticker].index if bst_data and ticker in bst_data else None)
+            shutil.rmtree(os.path.join(folder, ticker), ignore_errors=True)
+            if os.path.exists(os.path.join(folder, f"{ticker}.xlsx")): os.remove(os.path.join(folder, f"{ticker}.xlsx"))
+            os.makedirs(os.path.join(folder, ticker))
+            for label, df in frames.items():
+                self.write_frame(df, self.frame_path(folder, ticker, label))
+
+            if not self.xlsx or not frames: continue
+            with pd.ExcelWriter(os.path.join(folder, f"{ticker}.xlsx"), engine="openpyxl") as writer:
+                for sheet_name, df in frames.items():
                     # write to .xlsx
                     df = self.round_dataframe(df)
                     df.to_excel(writer, sheet_name=sheet_name[:20])
 
+    @staticmethod
+    def load_frame(path):
+        """
+        Loads a frame written by export_dataframe (.npy and uncompressed .feather
+        files are memory-mapped, columns are read without copies)
+        """
+        ext = os.path.splitext(path)[1]
+        if ext in [".npy", ".npz"]:
+            if ext == ".npy": data = np.load(path, mmap_mode="r")
+            else:
+                with np.load(path) as archive: data = archive["data"]
+            index = pd.DatetimeIndex(data[data.dtype.names[0]], name=data.dtype.names[0])
+            return pd.DataFrame({name: data[name] for name in data.dtype.names[1:]}, index=index, copy=False)
+        elif ext == ".parquet":
+            return pd.read_parquet(path, memory_map=True)
+        elif ext == ".feather":
+            df = pd.read_feather(path, memory_map=True)
+            return df.set_index(df.columns[0])
+        raise ValueError(f"Unsupported export format: {ext}.")
+
+    def load_frames(self, ticker, folder="data/debug"):
+        # load every exported frame of a ticker (label -> dataframe)
+        folder = os.path.join(folder, ticker)
+        return {
+            os.path.splitext(file)[0]: self.load_frame(os.path.join(folder, file))
+            for file in sorted(os.listdir(folder)) if file.endswith(f".{self.format}")
+        }
+
     def export_best_results(self, bst_data):
         # export best results (a spreadsheet for each ticker)
         with pd.ExcelWriter("data/results/results.xlsx", engine="openpyxl") as writer:
@@ -38,6 +106,38 @@ class Exporter:
                 bst_df = self.round_dataframe(bst_df)
                 bst_df.to_excel(writer, sheet_name=ticker[:10], index=False)
 
+    def export_traces(self, opt_data, folder="data/results"):
+        # export optimization traces as structured arrays (columns k, score, T, alpha, params)
+        for label, traces in opt_data.items():
+            for name, trace in traces.items():
+                np.save(os.path.join(folder, f"{label}_{name}.npy"), trace.data)
+
+    def export_walk_forward(self, wf_data):
+        # export walk-forward folds (a spreadsheet for each ticker)
+        with pd.ExcelWriter("data/results/walk_forward.xlsx", engine="openpyxl") as writer:
+            for ticker, folds in wf_data.items():
+                # write to .xlsx
+                wf_df = self.round_dataframe(pd.DataFrame(folds))
+                wf_df.to_excel(writer, sheet_name=ticker[:10], index=False)
+
+    def export_panel(self, panel_data):
+        # export panel rankings (a spreadsheet for each indicator space)
+        with pd.ExcelWriter("data/results/panel.xlsx", engine="openpyxl") as writer:
+            for label, ranking in panel_data.items():
+                # write to .xlsx
+                ranking = self.round_dataframe(ranking)
+                ranking.to_excel(writer, sheet_name=label[:20], index=False)
+
+    def export_presets(self, rankings, n=10):
+        # export the best strategies under every preset (summary, then the best n of each ticker)
+        with pd.ExcelWriter("data/results/presets.xlsx", engine="openpyxl") as writer:
+            self.round_dataframe(Strategies.best_by_preset(rankings)).to_excel(writer, sheet_name="Best", index=False)
+            for name, bst_data in rankings.items():
+                # write to .xlsx
+                ranking = pd.concat({ticker: bst_df.head(n) for ticker, bst_df in bst_data.items()}, names=["Ticker", "Label"]).reset_index(level=0) if bst_data else pd.DataFrame()
+                ranking = self.round_dataframe(ranking)
+                ranking.to_excel(writer, sheet_name=name[:20], index=False)
+
     def update_best_results(self, bst_data):
         # update best results (for use in trading_strategy_bot.py)
         with open("data/results/strategies.csv", "w") as f:
@@ -1,12 +1,54 @@
+import numpy as np
 import pandas as pd
+from .profiler import PROFILER
+
+
+# =====================================================
+#  Indicator Store
+# =====================================================
+class IndicatorStore:
+    """
+    Memoizes indicator series of a run, keyed by (ticker, function, window, extra args),
+    so candidates and algorithms sharing a window compute it only once
+    """
+    def __init__(self):
+        self.series = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def fetch(self, key, compute):
+        if key in self.series:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.series[key] = compute()
+        return self.series[key]
+
+    def missing(self, ticker, name, windows):
+        # windows not stored yet
+        return [w for w in windows if (ticker, name, int(w)) not in self.series]
+
+    def update(self, ticker, name, windows, matrix):
+        # store the columns of an all-windows matrix (n_bars, n_windows) as views
+        for i, window in enumerate(windows):
+            self.series.setdefault((ticker, name, int(window)), matrix[:, i])
+
+    def clear(self):
+        self.series.clear()
 
 
 # =====================================================
 #  Indicator
 # =====================================================
 class Indicator:
-    def __init__(self, indicator):
+    def __init__(self, indicator, store=None, ticker=None):
         self.indicator = indicator
+        self.store     = store if store is not None else IndicatorStore()
+        self.ticker    = ticker
+
+    def memo(self, fn, series, *args):
+        # indicator series from store (computed on first request)
+        return self.store.fetch((self.ticker, fn.__name__, *args), lambda: fn(series, *args).to_numpy())
 
     @staticmethod
     def sma(series:pd.Series, window:int) -> pd.Series:
@@ -15,20 +57,93 @@ class Indicator:
 
     @staticmethod
     def wma(series:pd.Series, window:int) -> pd.Series:
-        # weighted moving average (WMA)
-        w      = pd.Series(range(1, window+1), dtype=float)
-        return series.rolling(window=window).apply(lambda x: (x*w).sum()/w.sum(), raw=True)
+        # weighted moving average (WMA), running sums kernel (linear in bars)
+        return pd.Series(Indicator.sweep(series, [window], "wma")[:, 0], index=series.index)
 
     @staticmethod
     def ema(series:pd.Series, window:int) -> pd.Series:
         # exponential moving average (EMA)
         return series.ewm(span=window, adjust=False).mean()
         
+    @staticmethod
+    def rolling_std(series:pd.Series, window:int) -> pd.Series:
+        # rolling standard deviation
+        return series.rolling(window=window).std()
+
+    @staticmethod
+    @PROFILER.timed("indicator")
+    def sweep(series, windows, kind, block=4096):
+        """
+        All-windows kernel for parameter sweeps
+        parameters:
+        - series: series (or array) with closing prices
+        - windows: list with every window to compute
+        - kind: str with function name ("sma", "wma", "rolling_std" or "ema")
+        - block: bars per block (prefix sums restart at each block to bound rounding errors)
+        returns:
+        - (n_bars, n_windows) matrix (Fortran order, each column is contiguous)
+        """
+        x   = np.asarray(series, dtype=float)
+        w   = np.asarray(windows, dtype=int)
+        out = np.full((len(x), len(w)), np.nan, order="F")
+        if len(x) == 0 or len(w) == 0: return out
+
+        # ewm is a recursion: one compiled pandas pass per window (faster than
+        # stepping the bars of all windows in Python)
+        if kind == "ema":
+            series = pd.Series(x)
+            for i, wi in enumerate(w): out[:, i] = Indicator.ema(series, int(wi)).to_numpy()
+            return out
+
+        # missing samples: rolling kernels run on filled prices and windows
+        # containing a missing sample are masked afterwards
+        missing = np.isnan(x)
+        if missing.any():
+            if missing.all(): return out
+            out   = Indicator.sweep(pd.Series(x).ffill().bfill(), w, kind, block)
+            count = np.concatenate(([0], np.cumsum(missing)))
+            for i, wi in enumerate(w):
+                gaps = np.ones(len(x), dtype=bool)     # windows longer than the series stay NaN
+                if wi <= len(x): gaps[wi-1:] = count[wi:] -count[:len(x) -wi +1] > 0
+                out[gaps, i] = np.nan
+            return out
+
+        w_max = w.max()
+        for start in range(0, len(x), block):
+            end  = min(start +block, len(x))
+            low  = max(0, start -w_max +1)                  # history needed by the largest window
+            mean = x[low:end].mean()
+            seg  = x[low:end] -mean                         # local centering
+            P    = np.concatenate(([0.0], np.cumsum(seg)))  # P[k] = sum of seg[:k]
+            if kind == "rolling_std": P2 = np.concatenate(([0.0], np.cumsum(seg*seg)))
+            if kind == "wma":         Q  = np.concatenate(([0.0], np.cumsum(P)))
+
+            for i, wi in enumerate(w):
+                first = max(start, wi -1)                   # first bar with a full window
+                if first >= end: continue
+                k  = slice(first -low +1, end -low +1)      # prefix index of bars first..end-1
+                kw = slice(first -low +1 -wi, end -low +1 -wi)
+                s1 = P[k] -P[kw]
+
+                if kind == "sma":
+                    out[first:end, i] = s1/wi +mean
+                elif kind == "rolling_std":
+                    if wi < 2: continue
+                    var = (P2[k] -P2[kw] -s1*s1/wi)/(wi -1)
+                    out[first:end, i] = np.sqrt(np.maximum(var, 0.0))
+                elif kind == "wma":
+                    # sum of i*x over the window = w*P[k] -sum of the last w prefix sums
+                    num = wi*P[k] -(Q[k] -Q[kw])
+                    out[first:end, i] = num/(wi*(wi +1)/2) +mean
+                else:
+                    raise ValueError(f"Unsupported sweep kernel: {kind}.")
+        return out
+
     @staticmethod
     def bollinger_bands(series:pd.Series, window:int, std_dev:float=2.0):
         # bollinger bands (BB)
         middle = series.rolling(window=window).mean()
-        std    = series.rolling(window=window).std()
+        std    = Indicator.rolling_std(series, window)
         upper  = middle +(std_dev*std)
         lower  = middle -(std_dev*std)
         return middle, upper, lower
@@ -41,6 +156,7 @@ class Indicator:
         histogram   = macd_line -signal_line
         return macd_line, signal_line, histogram
         
+    @PROFILER.timed("indicator")
     def setup_indicator(self, df):
         """
         parameters:
@@ -49,7 +165,7 @@ class Indicator:
             - ind_t: str with indicator name ("SMA", "WMA", "EMA" or "BB")
             - ind_p: list with indicator values (10, 20)
         """
-        df     = df.copy()
+        df     = df.copy(deep=False)   # new columns only, prices are not copied (copy-on-write)
         ind_t  = self.indicator.get("ind_t", "")
         params = self.indicator.get("ind_p", [])
 
@@ -58,24 +174,110 @@ class Indicator:
             # 1 MA
             if len(params) == 1:
                 short = params[0]
-                df["Short"] = fn(df["Close"], short)
+                df["Short"] = self.memo(fn, df["Close"], short)
             # 2 MAs
             elif len(params) == 2:
                 short, long = params
-                df["Short"] = fn(df["Close"], short)
-                df["Long"]  = fn(df["Close"], long)
+                df["Short"] = self.memo(fn, df["Close"], short)
+                df["Long"]  = self.memo(fn, df["Close"], long)
             # 3 MAs
             elif len(params) == 3:
                 short, medium, long = params
-                df["Short"] = fn(df["Close"], short)
-                df["Mid"]   = fn(df["Close"], medium)
-                df["Long"]  = fn(df["Close"], long)
+                df["Short"] = self.memo(fn, df["Close"], short)
+                df["Mid"]   = self.memo(fn, df["Close"], medium)
+                df["Long"]  = self.memo(fn, df["Close"], long)
         elif ind_t == "BB":
+            # bollinger bands from stored mean and std (shared across std_dev values)
             window, std_dev = params
-            df["BB_Mid"], df["BB_Upper"], df["BB_Lower"] = self.bollinger_bands(df["Close"], window, std_dev)
+            middle = self.memo(self.sma, df["Close"], window)
+            std    = self.memo(self.rolling_std, df["Close"], window)
+            df["BB_Mid"], df["BB_Upper"], df["BB_Lower"] = middle, middle +(std_dev*std), middle -(std_dev*std)
         elif ind_t == "MACD":
+            # macd from stored fast and slow EMAs
             fast, slow, signal = params
-            df["MACD"], df["MACD_Signal"], df["MACD_Histogram"] = self.macd(df["Close"], fast, slow, signal)
+            df["MACD"]           = self.memo(self.ema, df["Close"], fast) -self.memo(self.ema, df["Close"], slow)
+            df["MACD_Signal"]    = df["MACD"].ewm(span=signal, adjust=False).mean()
+            df["MACD_Histogram"] = df["MACD"] -df["MACD_Signal"]
         else:
             raise ValueError(f"Unsupported indicator: {ind_t}.")    
-        return df
\ No newline at end of file
+        return df
+
+    @staticmethod
+    @PROFILER.timed("indicator")
+    def setup_batch(close, ind_t, param_matrix, store=None, ticker=None):
+        """
+        parameters:
+        - close: series (or array) with closing prices
+        - ind_t: str with indicator name ("SMA", "WMA", "EMA", "BB" or "MACD")
+        - param_matrix: array (N, n_params) with one parameter vector per row
+        - store, ticker: indicator store shared with setup_indicator (optional)
+        returns:
+        - dictionary of (n_bars, N) arrays named as the columns of setup_indicator
+        """
+        close  = pd.Series(np.asarray(close, dtype=float))
+        params = np.atleast_2d(np.asarray(param_matrix))
+        memo   = Indicator({}, store, ticker).memo
+
+        def stack(fn, windows):
+            # each distinct window is computed only once
+            columns = {w: memo(fn, close, int(w)) for w in np.unique(windows)}
+            return np.column_stack([columns[w] for w in windows])
+
+        if ind_t in ["SMA", "WMA", "EMA"]:
+            fn    = getattr(Indicator, ind_t.lower())
+            names = {1: ["Short"], 2: ["Short", "Long"], 3: ["Short", "Mid", "Long"]}[params.shape[1]]
+            return {name: stack(fn, params[:, i]) for i, name in enumerate(names)}
+        elif ind_t == "BB":
+            middle  = stack(Indicator.sma, params[:, 0])
+            std     = stack(Indicator.rolling_std, params[:, 0])
+            std_dev = params[:, 1].astype(float)
+            return {"BB_Mid": middle, "BB_Upper": middle +std_dev*std, "BB_Lower": middle -std_dev*std}
+        elif ind_t == "MACD":
+            macd_line   = stack(Indicator.ema, params[:, 0]) -stack(Indicator.ema, params[:, 1])
+            signal_line = np.empty_like(macd_line)
+            for signal in np.unique(params[:, 2]):
+                # one ewm call for all candidates sharing the same signal span
+                cols = np.flatnonzero(params[:, 2] == signal)
+                signal_line[:, cols] = pd.DataFrame(macd_line[:, cols]).ewm(span=int(signal), adjust=False).mean().to_numpy()
+            return {"MACD": macd_line, "MACD_Signal": signal_line, "MACD_Histogram": macd_line -signal_line}
+        else:
+            raise ValueError(f"Unsupported indicator: {ind_t}.")
+
+    @staticmethod
+    @PROFILER.timed("indicator")
+    def setup_panel(close, ind_t, params, store=None):
+        """
+        parameters:
+        - close: array (n_bars, n_tickers), each column holds the bars of one ticker
+          followed by NaN padding (see Panel)
+        - ind_t: str with indicator name ("SMA", "WMA", "EMA", "BB" or "MACD")
+        - params: list with one parameter vector
+        - store: indicator store shared across candidates (optional)
+        returns:
+        - dictionary of (n_bars, n_tickers) arrays named as the columns of setup_indicator
+        """
+        frame = pd.DataFrame(np.asarray(close, dtype=float))
+        store = store if store is not None else IndicatorStore()
+
+        def memo(fn, window):
+            # every ticker at once (rolling/ewm run column-wise, wma column by column)
+            window  = int(window)
+            compute = (lambda: frame.apply(fn, args=(window,)).to_numpy()) if fn is Indicator.wma else (lambda: fn(frame, window).to_numpy())
+            return store.fetch(("__panel__", fn.__name__, window), compute)
+
+        if ind_t in ["SMA", "WMA", "EMA"]:
+            fn    = getattr(Indicator, ind_t.lower())
+            names = {1: ["Short"], 2: ["Short", "Long"], 3: ["Short", "Mid", "Long"]}[len(params)]
+            return {name: memo(fn, window) for name, window in zip(names, params)}
+        elif ind_t == "BB":
+            window, std_dev = params
+            middle = memo(Indicator.sma, window)
+            std    = memo(Indicator.rolling_std, window)
+            return {"BB_Mid": middle, "BB_Upper": middle +std_dev*std, "BB_Lower": middle -std_dev*std}
+        elif ind_t == "MACD":
+            fast, slow, signal = params
+            macd_line   = memo(Indicator.ema, fast) -memo(Indicator.ema, slow)
+            signal_line = pd.DataFrame(macd_line).ewm(span=int(signal), adjust=False).mean().to_numpy()
+            return {"MACD": macd_line, "MACD_Signal": signal_line, "MACD_Histogram": macd_line -signal_line}
+        else:
+            raise ValueError(f"Unsupported indicator: {ind_t}.")
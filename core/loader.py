@@ -1,25 +1,32 @@
 import os, json
-import yfinance as yf
+import pandas as pd
 from datetime import datetime
+from .market import YahooSource, MarketStore
+from .config import RunConfig, thaw
 
 
 # =====================================================
 #  Loader
 # =====================================================
 class Loader:
-    def __init__(self, file_config="config/config.json", file_tickers=None, file_indicators=None):
+    def __init__(self, file_config="config/config.json", file_tickers=None, file_indicators=None, source=None, clear=True):
         self.file_tickers = file_tickers
-        self.file_config  = file_config
         self.folder       = "data/results"
+        self.source       = source if source is not None else YahooSource()
         self.load_config(file_config)
-        self.clear_folder()
+        self.store        = MarketStore(self.store_folder) if self.store_folder else None
+        if clear: self.clear_folder()
         
     def load_config(self, path):
-        with open(path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            self.start  = config.get("start", "2024-01-01")
-            self.end    = config.get("end", datetime.now())
-            self.market = config.get("market", "US")
+        config = RunConfig.load(path)
+        self.config = config
+        self.start  = config.get("start", "2024-01-01")
+        self.end    = config.get("end", datetime.now())
+        self.market = config.get("market", "US")
+        self.workers = config.workers
+        self.store_folder = config.get("market_store", "data/market")
+        self.wf_cfg  = config.get("walk_forward", {})
+        self.panel_cfg = config.get("panel", {})
         
     def load_tickers(self):
         with open(self.file_tickers, "r", encoding="utf-8") as f:
@@ -50,15 +57,13 @@ class Loader:
     SUFFIXES = {"AU":".AX", "BR":".SA", "CN":".SS", "CA":".TO"}
     
     def load_search_space(self):    
-        with open(self.file_config, "r", encoding="utf-8") as f:
-            config = json.load(f)
-        optimize = config.get("optimize")
+        optimize = self.config.get("optimize")
         
         space = []
         for opt in optimize:
             space.append({
                 "ind_t":  opt["ind_t"],
-                "params": opt["params"]
+                "params": thaw(opt["params"])
             })
         return space
     
@@ -68,15 +73,35 @@ class Loader:
         return ticker
 
     def download_data(self, ticker):
-        # collect OHLCVDS data from Yahoo Finance
+        # collect Close/Volume data (local store first, then only the missing range from the source)
+        symbol = self.format_ticker(ticker)
+        start  = pd.Timestamp(self.start)
+        end    = pd.Timestamp(self.end)
+        cached = self.store.load(symbol) if self.store else None
+        base   = cached     # bars kept from the store
+        
         try:
-            df = yf.download(self.format_ticker(ticker), self.start, self.end, auto_adjust=True)
+            if cached is None or cached.empty or cached.index[0] > start:
+                df = self.source.fetch(symbol, start, end)
+            elif cached.index[-1] < end:
+                # refresh from the last stored bar (it may have been partial), with one complete bar of overlap
+                df = self.source.fetch(symbol, cached.index[max(len(cached) -2, 0)], end)
+                if not self.store.consistent(cached, df):
+                    # adjusted history rescaled (dividend/split): refetch the whole range and rewrite the store
+                    df, base = self.source.fetch(symbol, min(start, cached.index[0]), end), None
+            else:
+                df = cached.iloc[:0]
+            
+            if self.store:
+                df = self.store.merge(base, df)
+                self.store.save(symbol, df)
         except Exception as err:
-            raise RuntimeError("Unexpected error in download_data.") from err
+            # offline: fall back to the local store
+            if cached is None: raise RuntimeError("Unexpected error in download_data.") from err
+            df = cached
         
-        # format data
-        df.columns = df.columns.droplevel(1)    
-        df = df[["Close", "Volume"]]
+        df = df.loc[(df.index >= start) & (df.index < end), ["Close", "Volume"]]
+        if df.empty: raise RuntimeError(f"No data available for {ticker}.")
         return df
     
     def clear_folder(self):
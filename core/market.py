@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+#  Market data sources
+# =====================================================
+class YahooSource:
+    """
+    Downloads Close/Volume data from Yahoo Finance
+    (any object with the same fetch method can be used as source)
+    """
+    def fetch(self, ticker, start, end):
+        import yfinance as yf
+        df = yf.download(ticker, start, end, auto_adjust=True, progress=False)
+        if df.empty: return pd.DataFrame(columns=["Close", "Volume"], dtype=float)
+
+        # format data
+        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.droplevel(1)
+        return df[["Close", "Volume"]]
+
+
+class CsvSource:
+    """
+    Reads Close/Volume data from local files {folder}/{ticker}.csv (with a Date column)
+    """
+    def __init__(self, folder):
+        self.folder = folder
+
+    def fetch(self, ticker, start, end):
+        df = pd.read_csv(os.path.join(self.folder, f"{ticker}.csv"), index_col="Date", parse_dates=True)
+        return df.loc[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end)), ["Close", "Volume"]]
+
+
+# =====================================================
+#  Market Store
+# =====================================================
+class MarketStore:
+    """
+    On-disk Close/Volume store, one memory-mappable .npy file per ticker
+    """
+    DTYPE = np.dtype([("Date", "i8"), ("Close", "f8"), ("Volume", "f8")])
+
+    def __init__(self, folder="data/market"):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, ticker):
+        return os.path.join(self.folder, f"{ticker}.npy")
+
+    def load(self, ticker):
+        if not os.path.isfile(self.path(ticker)): return None
+        data  = np.load(self.path(ticker), mmap_mode="r")
+        index = pd.DatetimeIndex(data["Date"].astype("datetime64[ns]"), name="Date")
+        return pd.DataFrame({"Close": data["Close"], "Volume": data["Volume"]}, index=index)
+
+    def save(self, ticker, df):
+        data = np.empty(len(df), dtype=self.DTYPE)
+        data["Date"]   = df.index.values.astype("datetime64[ns]").astype("i8")
+        data["Close"]  = df["Close"].to_numpy(dtype=float)
+        data["Volume"] = df["Volume"].to_numpy(dtype=float)
+
+        # write to a temporary file first, so an interrupted run keeps the previous store
+        tmp = self.path(ticker) +".tmp"
+        with open(tmp, "wb") as f: np.save(f, data)
+        os.replace(tmp, self.path(ticker))
+
+    @staticmethod
+    def consistent(cached, new, rtol=1e-6):
+        """
+        Whether refetched bars agree with the cached ones they overlap (the last
+        cached bar may have been partial and is not compared). Adjusted prices
+        are rescaled by dividends and splits, which makes the cache stale.
+        """
+        overlap = cached.index[:-1].intersection(new.index)
+        if overlap.empty: return True
+        old = cached.loc[overlap, "Close"].to_numpy(dtype=float)
+        new = new.loc[overlap, "Close"].to_numpy(dtype=float)
+        return bool(np.allclose(old, new, rtol=rtol, atol=0, equal_nan=True))
+
+    def merge(self, cached, new):
+        # append new bars, refreshed bars override the cached ones
+        if cached is None: return new.sort_index()
+        df = pd.concat([cached, new])
+        return df[~df.index.duplicated(keep="last")].sort_index()
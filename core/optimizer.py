@@ -1,43 +1,115 @@
-from .indicator import Indicator
+from .indicator import Indicator, IndicatorStore
 from .backtester import Backtester
 from .strategies import Strategies
-import json, math, random, copy, itertools
+from .cache import EvaluationCache
+from .results import ResultStore
+from .checkpoint import Checkpoint
+from .streaming import IncrementalBacktest
+from .profiler import PROFILER
+from .trace import TraceWriter, OptTrace
+from .surrogate import GaussianProcess
+from .prices import PriceRegistry
+from .config import RunConfig
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+import math, random, copy, itertools
+import numpy as np
+
+
+def chain_job(prices, search_space, file_config, algorithm, chain, seed, start_indicator, shared, ticker=None, bars=None):
+    """
+    Runs one chain of a multi-start search (worker process), returning its
+    evaluations (without dataframes), traces and best candidate
+    """
+    PROFILER.load_config(file_config)
+    with PROFILER.scope() as profile:
+        random.seed(seed)
+        optimization = Optimizer(PriceRegistry.attach(prices), search_space, file_config, ticker=ticker, bars=bars)
+        optimization.shared, optimization.chain = shared, chain
+        optimization.checkpoints = None
+        optimization.trace = TraceWriter(f"data/results/{optimization.run_name()}_trace.jsonl", optimization.trace_cfg.get("sample", 1), optimization.trace_cfg.get("buffer", 1000))
+        if optimization.sweep: optimization.prepare_sweep()
+        x_i, f_i = getattr(optimization, algorithm)(start_indicator=start_indicator)
+        optimization.trace.close()
+    return {
+        "data": [{**step, "df": None} for step in optimization.data],
+        "opt_local": optimization.opt_local,
+        "opt_global": optimization.opt_global,
+        "x_i": x_i,
+        "f_i": f_i,
+        "profile": profile,
+    }
 
 
 # =====================================================
 #  Optimizer
 # =====================================================
 class Optimizer:
-    def __init__(self, df, search_space, file_config="config/config.json"):
+    def __init__(self, df, search_space, file_config="config/config.json", store=None, ticker=None, resume=False, bars=None):
         self.df         = df
+        self.bars       = bars if bars is not None else slice(None)   # bars to backtest (indicators use the whole df)
         self.space      = search_space
+        self.store      = store if store is not None else IndicatorStore()
+        self.ticker     = ticker
         self.data       = []
-        self.opt_local  = []
-        self.opt_global = []
-        self.cache      = {}
+        self.opt_local  = OptTrace(len(search_space["params"]))
+        self.opt_global = OptTrace(len(search_space["params"]))
+        self.results    = None
+        self.stored     = {}
+        self.stream     = None       # streaming state of the evaluated candidates (result store runs)
+        self.resume     = resume
+        self.done       = []
+        self.resumed    = None
+        self.logged     = None       # steps already in the checkpoint log (None: log not started)
+        self.shared     = None       # metrics evaluated by the other chains of a multi-start search
+        self.chain      = None
         self.load_config(file_config)
         
     def load_config(self, path):
-        with open(path, "r", encoding="utf-8") as f: config = json.load(f)
+        config      = RunConfig.load(path)
+        self.config = config
+        self.strategies = Strategies(config)
         self.sa_cfg = config.get("simulated_annealing", {})
         self.hc_cfg = config.get("hill_climbing", {})
         self.ga_cfg = config.get("genetic_algorithm", {})
         self.gs_cfg = config.get("grid_search", {})
+        self.bo_cfg = config.get("bayesian_optimization", {})
+        self.sh_cfg = config.get("successive_halving", {})
+        self.stream_cfg = config.get("streaming", {})
+        self.lean   = config.lean
+        self.sweep  = config.sweep
+        self.top_n  = config.top_n
+        self.batch_bytes = config.get("batch_mb", 512)*1024**2     # memory of a vectorized backtest chunk
+        self.result_path = config.result_store
+        self.checkpoint_every = config.checkpoint_every
+        self.trace_cfg = config.get("trace", {})
+        
+        # evaluation cache (bounded number of dataframes)
+        cache_cfg   = config.get("cache", {})
+        max_mb      = cache_cfg.get("max_mb")
+        self.cache  = EvaluationCache(
+            max_frames = cache_cfg.get("max_frames"),
+            max_bytes  = max_mb*1024**2 if max_mb is not None else None,
+            keep_top   = cache_cfg.get("keep_top", self.top_n),
+        )
         
     def evaluate(self, indicator):
         indicator_key = (indicator["ind_t"], tuple(indicator["ind_p"]))
 
-        if indicator_key in self.cache:
-            return self.cache[indicator_key]
+        # lean mode: metrics only, dataframe is rebuilt on demand
+        if self.lean:
+            return self.evaluate_batch([indicator])[0]
         
-        df = self.df.copy()
+        cached = self.cache.get(indicator_key)
+        if cached is not None:
+            return cached
         
-        # setup indicator
-        df = Indicator(indicator).setup_indicator(df)
-
-        # run backtest
-        backtest = Backtester(df)
-        df       = backtest.run_strategy(indicator)
+        # stored by a previous run or evaluated by another chain
+        known = self.known(indicator_key)
+        if known is not None:
+            return self.record(indicator_key, indicator, None, known, self.strategies)
+        
+        df = self.materialize(indicator)
         
         # compute metrics
         metrics = {
@@ -47,30 +119,237 @@ class Optimizer:
             "Sharpe": df["Strategy"].mean() / df["Strategy"].std()*pow(len(df), 0.5),
             "Max_Drawdown": abs(df["Drawdown"].min()),
         }
-        
+        return self.record(indicator_key, indicator, df, metrics, self.strategies, save=True)
+    
+    def record(self, key, indicator, df, metrics, strategies, save=False):
         # compute score
-        score = Strategies().compute_score(metrics)
+        with PROFILER.stage("scoring"): score = strategies.compute_score(metrics)
+        PROFILER.count("evaluations")
         
         # append to data
-        self.cache[indicator_key] = (score, df, metrics)
-        self.data.append({"indicator": indicator, "df": df, "metrics": metrics, "score": score})
+        step = {"indicator": indicator, "df": df, "metrics": metrics, "score": score}
+        self.cache.put(key, step)
+        self.data.append(step)
+        
+        if save: self.persist(key, metrics)
         return score, df, metrics
     
+    def persist(self, key, metrics):
+        # share/persist a new evaluation
+        if self.shared is not None: self.shared[key] = metrics
+        if self.results is not None:
+            self.results.add(self.ticker or "", self.fingerprint, key[0], key[1], Backtester.VERSION, metrics, str(self.df.index[self.bars][0]), str(self.df.index[self.bars][-1]))
+    
+    def materialize(self, indicator):
+        # setup indicator (on a new frame, self.df may be a read-only shared view)
+        df = Indicator(indicator, self.store, self.ticker).setup_indicator(self.df)
+
+        # run backtest
+        backtest = Backtester(df.iloc[self.bars])
+        return backtest.run_strategy(indicator)
+    
+    def evaluate_batch(self, indicators):
+        """
+        Evaluates a population of candidates (same ind_t) in one vectorized backtest.
+        The full dataframe is not built, use materialize() to rebuild it on demand.
+        """
+        keys    = [(x["ind_t"], tuple(x["ind_p"])) for x in indicators]
+        pending = {}
+        for key, x in zip(keys, indicators):
+            if key not in pending and self.cache.get(key) is None: pending[key] = x
+        
+        if pending:
+            ind_t      = next(iter(pending))[0]
+            known      = {key: self.known(key) for key in pending}
+            compute    = [key for key in pending if known[key] is None]
+            strategies = self.strategies
+            computed   = {}
+            
+            if compute:
+                _, batch_metrics = Backtester.run_batch(self.df["Close"], self.df["Volume"], ind_t, [key[1] for key in compute], self.store, self.ticker, self.bars, full=False, max_bytes=self.batch_bytes)
+                for i, key in enumerate(compute):
+                    computed[key] = {name: values[i] for name, values in batch_metrics.items()}
+            
+            for key, x in pending.items():
+                if key in computed: self.record(key, x, None, computed[key], strategies, save=True)
+                else:               self.record(key, x, None, known[key], strategies)
+        return [self.cache[key] for key in keys]
+    
+    def known(self, key):
+        # metrics stored by a previous run or shared by another chain (None otherwise)
+        if key[1] in self.stored: return self.stored[key[1]]
+        if self.shared is None: return None
+        metrics = self.shared.get(key)
+        if metrics is not None: PROFILER.count("shared_hits")
+        return metrics
+    
+    def evaluate_fidelity(self, indicators, fraction):
+        """
+        Scores candidates (same ind_t) on the leading fraction of the backtest bars.
+        Partial scores are not cached nor recorded, fraction 1 goes through
+        evaluate_batch (full history, recorded as usual).
+        returns:
+        - array with the score of each candidate
+        """
+        if fraction >= 1: return np.array([f for f, _, _ in self.evaluate_batch(indicators)])
+        bars = range(len(self.df))[self.bars]
+        part = slice(bars.start, bars.start +max(2, math.ceil(fraction*len(bars))))
+        _, metrics = Backtester.run_batch(self.df["Close"], self.df["Volume"], indicators[0]["ind_t"], [x["ind_p"] for x in indicators], self.store, self.ticker, part, full=False, max_bytes=self.batch_bytes)
+        PROFILER.count("partial_evaluations", len(indicators))
+        with PROFILER.stage("scoring"): return self.strategies.compute_score(metrics)
+    
+    def best(self, n=None):
+        """
+        Returns the n best evaluated steps with their dataframe materialized
+        (top_n in lean mode, every step otherwise)
+        """
+        if n is None: n = self.top_n if self.lean else len(self.data)
+        steps = sorted(self.data, key=lambda step: step["score"], reverse=True)[:n]
+        for step in steps:
+            if step["df"] is None: step["df"] = self.materialize(step["indicator"])
+        return steps
+    
     def search(self):
-        start_indicator = {"ind_t": self.space["ind_t"], "ind_p": [p["min"] for p in self.space["params"]]}
-        self.log   = open(f"data/results/{start_indicator['ind_t']}_log.txt", "w")
-        
-        if self.sa_cfg.get("enabled"):  
-            best_params, best_score = self.simulated_annealing(start_indicator=start_indicator)
-        if self.hc_cfg.get("enabled"):
-            best_params, best_score = self.hill_climbing(start_indicator=start_indicator)
-        if self.gs_cfg.get("enabled"):
-            best_params, best_score = self.grid_search(start_indicator=start_indicator)
-        if self.ga_cfg.get("enabled"):
-            best_params, best_score = self.genetic_algorithm(start_indicator=start_indicator)
-        self.log.close()
+        start_indicator  = {"ind_t": self.space["ind_t"], "ind_p": [p["min"] for p in self.space["params"]]}
+        self.fingerprint = ResultStore.fingerprint(self.df) +self.bars_label()
+        self.checkpoints = Checkpoint() if self.checkpoint_every else None
+        if self.resume and self.checkpoints: self.load_checkpoint()
+        self.trace = TraceWriter(f"data/results/{self.run_name()}_trace.jsonl", self.trace_cfg.get("sample", 1), self.trace_cfg.get("buffer", 1000), append=bool(self.resumed))
+        if self.sweep: self.prepare_sweep()
+        if self.result_path: self.open_results()
+        
+        algorithms = [
+            ("simulated_annealing", self.sa_cfg, self.simulated_annealing),
+            ("hill_climbing", self.hc_cfg, self.hill_climbing),
+            ("grid_search", self.gs_cfg, self.grid_search),
+            ("genetic_algorithm", self.ga_cfg, self.genetic_algorithm),
+            ("bayesian_optimization", self.bo_cfg, self.bayesian_optimization),
+            ("successive_halving", self.sh_cfg, self.successive_halving),
+        ]
+        for name, cfg, algorithm in algorithms:
+            # algorithms completed before a restart are not run again
+            if not cfg.get("enabled") or name in self.done: continue
+            if cfg.get("chains", 1) > 1 and name in ["simulated_annealing", "hill_climbing"]:
+                best_params, best_score = self.multi_start(name, cfg, start_indicator)
+            else:
+                best_params, best_score = algorithm(start_indicator=start_indicator)
+            self.done.append(name)
+            self.checkpoint(name, None, force=True)
+        self.trace.close()
+        if self.results is not None:
+            if self.streaming(): self.save_stream()
+            self.results.close()
         return self.data
     
+    def bars_label(self):
+        return "" if self.bars == slice(None) else f"_{self.bars.start}_{self.bars.stop}"
+    
+    def run_name(self):
+        # unique per (ticker, indicator space, bars, chain), names checkpoint and trace files
+        chain = f"_chain{self.chain}" if self.chain is not None else ""
+        return f"{self.ticker or 'ticker'}_{self.space['ind_t']}{len(self.space['params'])}{self.bars_label()}{chain}"
+    
+    def checkpoint(self, algorithm, state, k=0, force=False):
+        # save optimizer state every checkpoint_every iterations (steps are appended, not rewritten)
+        if self.checkpoints is None or not (force or k % self.checkpoint_every == 0): return
+        self.trace.flush()
+        self.checkpoints.save(self.run_name(), {
+            "fingerprint": self.fingerprint,
+            "space": self.space,
+            "done": self.done,
+            "algorithm": algorithm,
+            "state": state,
+            "opt_local": self.opt_local,
+            "opt_global": self.opt_global,
+            "random": random.getstate(),
+        }, [{**step, "df": None} for step in self.data[self.logged or 0:]], append=self.logged is not None)
+        self.logged = len(self.data)
+    
+    def load_checkpoint(self):
+        # restore traces, evaluations and state of the interrupted algorithm (same data and space only)
+        saved = self.checkpoints.load(self.run_name())
+        if saved is None or saved["fingerprint"] != self.fingerprint or saved["space"] != self.space: return
+        self.resumed    = saved
+        self.done       = saved["done"]
+        self.data       = saved["data"]
+        self.logged     = len(self.data)
+        self.opt_local  = saved["opt_local"]
+        self.opt_global = saved["opt_global"]
+        for step in self.data:
+            self.cache.put((step["indicator"]["ind_t"], tuple(step["indicator"]["ind_p"])), step)
+        random.setstate(saved["random"])
+    
+    def restore(self, algorithm, **state):
+        # state of the algorithm interrupted by a restart (given defaults otherwise)
+        if self.resumed and self.resumed["algorithm"] == algorithm and self.resumed["state"]:
+            state = {**state, **self.resumed["state"]}
+            self.resumed["state"] = None
+        return tuple(state.values())
+    
+    def open_results(self):
+        # load evaluations stored by previous runs (same ticker, data, bars and backtest version)
+        index        = self.df.index[self.bars]
+        self.results = ResultStore(self.result_path)
+        self.stored  = self.results.load(self.ticker or "", self.fingerprint, self.space["ind_t"], Backtester.VERSION, str(index[0]), str(index[-1]))
+        if self.streaming(): self.open_stream()
+
+    def streaming(self):
+        # streaming states are kept for whole history runs only (not walk-forward folds)
+        return self.stream_cfg.get("enabled", False) and self.bars == slice(None) and len(self.df) > 0
+
+    def stream_name(self):
+        return f"{self.space['ind_t']}{len(self.space['params'])}"
+
+    def open_stream(self):
+        """
+        Advances the streaming state saved by the previous run over the bars appended
+        since (O(new bars)), so every candidate it holds is known without a backtest
+        """
+        saved = self.results.load_stream(self.ticker or "", self.stream_name(), Backtester.VERSION)
+        if saved is None: return
+        fingerprint, stream = saved
+        if stream.n > len(self.df) or ResultStore.fingerprint(self.df.iloc[:stream.n]) != fingerprint: return
+        with PROFILER.stage("streaming"): stream.advance(self.df["Close"].to_numpy()[stream.n:])
+        metrics = stream.metrics()
+        index   = self.df.index
+        for i, key in enumerate(stream.keys()):
+            if key in self.stored: continue
+            self.stored[key] = {name: values[i] for name, values in metrics.items()}
+            self.results.add(self.ticker or "", self.fingerprint, self.space["ind_t"], key, Backtester.VERSION, self.stored[key], str(index[0]), str(index[-1]))
+        self.stream = stream
+
+    def save_stream(self):
+        # extend the streaming state with the candidates evaluated in this run and persist it
+        known  = set(self.stream.keys()) if self.stream is not None else set()
+        params = list(dict.fromkeys(tuple(step["indicator"]["ind_p"]) for step in self.data if tuple(step["indicator"]["ind_p"]) not in known))
+        if params:
+            with PROFILER.stage("streaming"): stream = IncrementalBacktest.from_history(self.df["Close"], self.df["Volume"], self.space["ind_t"], params, self.store, self.ticker, self.batch_bytes)
+            self.stream = stream if self.stream is None else self.stream.merge(stream)
+        if self.stream is not None: self.results.save_stream(self.ticker or "", self.stream_name(), Backtester.VERSION, ResultStore.fingerprint(self.df), self.stream)
+    
+    def prepare_sweep(self):
+        """
+        Precomputes every window declared in the search space (min..max) with the
+        all-windows kernels, so candidates index the store instead of recomputing
+        """
+        ind_t  = self.space["ind_t"]
+        params = self.space["params"]
+        if ind_t in ["SMA", "WMA", "EMA"]:
+            plan = [(ind_t.lower(), p) for p in params]
+        elif ind_t == "BB":
+            plan = [("sma", params[0]), ("rolling_std", params[0])]
+        elif ind_t == "MACD":
+            plan = [("ema", params[0]), ("ema", params[1])]
+        else:
+            raise ValueError(f"Unsupported indicator: {ind_t}.")
+        
+        windows = {}
+        for kind, p in plan:
+            windows.setdefault(kind, set()).update(range(p["min"], p["max"]+1))
+        for kind, ws in windows.items():
+            ws = self.store.missing(self.ticker, kind, sorted(ws))      # folds sharing the store sweep once
+            if ws: self.store.update(self.ticker, kind, ws, Indicator.sweep(self.df["Close"], ws, kind))
+    
     def random_neighbor(self, indicator, alpha):
         x = copy.deepcopy(indicator)
 
@@ -80,7 +359,10 @@ class Optimizer:
             step  = max(1, round(alpha*(pmax -pmin)/4))
             new_v = val +random.randint(-step, step)
             x["ind_p"][i] = max(pmin, min(pmax, new_v))
-                    
+        return self.constrain(x)
+    
+    def constrain(self, x):
+        # keep parameter relations valid (MACD: fast and signal below slow)
         if x["ind_t"] == "MACD":
             fast, slow, signal = x["ind_p"]
             if fast   >= slow: fast   = slow -1
@@ -92,30 +374,78 @@ class Optimizer:
 
         return x     
 
+    def sample(self, n):
+        # n random valid candidates (seeded from the random module, so checkpoints resume the sequence)
+        rng  = np.random.default_rng(random.getrandbits(32))
+        low  = [p["min"] for p in self.space["params"]]
+        high = [p["max"] +1 for p in self.space["params"]]
+        return [self.constrain({"ind_t": self.space["ind_t"], "ind_p": [int(v) for v in row]}) for row in rng.integers(low, high, (n, len(low)))]
+
+    def multi_start(self, name, cfg, start_indicator):
+        """
+        Runs cfg["chains"] independent chains of a local search in a process pool,
+        the first from start_indicator and the others from random points. Chains
+        share evaluated metrics through a manager dictionary (seeded with the
+        evaluations of this optimizer and the stored ones), so a candidate is
+        backtested once.
+        returns:
+        - best (x_i, f_i) of all chains; evaluations and local traces of every chain
+          are merged, the global trace is the one of the best chain
+        """
+        chains  = cfg.get("chains", 1)
+        workers = cfg.get("workers", chains)
+        seeds   = [random.getrandbits(32) for _ in range(chains)]
+        starts  = [start_indicator] +self.sample(chains -1)
+        
+        with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+            shared  = manager.dict({**{(self.space["ind_t"], params): metrics for params, metrics in self.stored.items()}, **{key: step["metrics"] for key, step in self.cache.entries.items()}})
+            futures = [pool.submit(chain_job, PriceRegistry.handle(self.df), self.space, self.config, name, i, seeds[i], starts[i], shared, self.ticker, self.bars) for i in range(chains)]
+            results = [future.result() for future in futures]
+        
+        for i, result in enumerate(results):
+            for step in result["data"]:
+                # evaluations already counted and scored by the chain
+                key = (step["indicator"]["ind_t"], tuple(step["indicator"]["ind_p"]))
+                if key in self.cache: continue
+                self.cache.put(key, step)
+                self.data.append(step)
+                self.persist(key, step["metrics"])
+            self.opt_local.merge(result["opt_local"])
+            self.trace.write({"algorithm": name, "chain": i, "params": result["x_i"]["ind_p"].copy(), "score": result["f_i"]})
+            PROFILER.merge(PROFILER.stats, result["profile"])
+        
+        best = max(results, key=lambda result: result["f_i"])
+        self.opt_global.merge(best["opt_global"])
+        self.trace.flush()
+        return best["x_i"], best["f_i"]
+
     def hill_climbing(self, start_indicator, alpha=1, eps=1e-6, k_limit=10, k=0, k_no_improve=0):
         alpha        = self.hc_cfg.get("alpha", 1)
         N            = self.hc_cfg.get("n", 3)
         k_max        = self.hc_cfg.get("k_max", 60)
         x_i          = start_indicator
         f_i, _, _    = self.evaluate(x_i)
+        k, k_no_improve, alpha, x_i, f_i = self.restore("hill_climbing", k=k, k_no_improve=k_no_improve, alpha=alpha, x_i=x_i, f_i=f_i)
                 
         while k < k_max:
             k = k +1
+            flag_improve = False
             
             for _ in range(N):
                 x_j       = self.random_neighbor(x_i, alpha)
                 f_j, _, _ = self.evaluate(x_j)
-                self.opt_local.append({"k": k, "score": f_i, "alpha": alpha, "params": x_j["ind_p"].copy()})
+                self.opt_local.add(k, f_i, x_j["ind_p"], alpha=alpha)
                 
                 if f_j > f_i +eps:
                     x_i = x_j
                     f_i = f_j
                     flag_improve = True
                     
-            self.opt_global.append({"k": k, "score": f_i, "T": None, "alpha": alpha, "params": x_i["ind_p"].copy()})
-            self.log.write(f"k = {k}: x = {x_i} | f(x) = {f_i:.4f} | alpha = {alpha:.2f}\n")
+            self.opt_global.add(k, f_i, x_i["ind_p"], alpha=alpha)
+            self.trace.write({"algorithm": "hill_climbing", "k": k, "params": x_i["ind_p"].copy(), "score": f_i, "alpha": alpha})
             if flag_improve: k_no_improve = 0
             else: k_no_improve += 1
+            self.checkpoint("hill_climbing", {"k": k, "k_no_improve": k_no_improve, "alpha": alpha, "x_i": x_i, "f_i": f_i}, k)
             if k_no_improve >= k_limit: break
 
         return x_i, f_i
@@ -127,6 +457,7 @@ class Optimizer:
         T            = 1
         x_i          = start_indicator
         f_i, _, _    = self.evaluate(x_i)
+        k, k_no_improve, T, alpha, x_i, f_i = self.restore("simulated_annealing", k=k, k_no_improve=k_no_improve, T=T, alpha=alpha, x_i=x_i, f_i=f_i)
         
         while k < k_max:
             k = k +1
@@ -134,7 +465,7 @@ class Optimizer:
             for _ in range(N):
                 x_j       = self.random_neighbor(x_i, alpha)
                 f_j, _, _ = self.evaluate(x_j)
-                self.opt_local.append({"k": k, "score": f_j, "T": T, "alpha": alpha, "params": x_j["ind_p"].copy()})
+                self.opt_local.add(k, f_j, x_j["ind_p"], T, alpha)
 
                 if f_j > f_i +eps:
                     x_i = x_j
@@ -150,11 +481,12 @@ class Optimizer:
                         
             T     = beta*T
             alpha = beta_alpha*alpha
-            self.opt_global.append({"k": k, "score": f_i, "T": T, "alpha": alpha, "params": x_i["ind_p"].copy()})
-            self.log.write(f"k = {k}: x = {x_i} | f(x) = {f_i:.4f} | T = {T:.2f} | alpha = {alpha:.2f}\n")
+            self.opt_global.add(k, f_i, x_i["ind_p"], T, alpha)
+            self.trace.write({"algorithm": "simulated_annealing", "k": k, "params": x_i["ind_p"].copy(), "score": f_i, "T": T, "alpha": alpha})
+            self.checkpoint("simulated_annealing", {"k": k, "k_no_improve": k_no_improve, "T": T, "alpha": alpha, "x_i": x_i, "f_i": f_i}, k)
             if k_no_improve >= k_limit: break
             
-        self.log.flush()
+        self.trace.flush()
         return x_i, f_i
     
     def genetic_algorithm(self, start_indicator, eps=1e-6, k_limit=10, k=0, k_no_improve=0):
@@ -164,6 +496,7 @@ class Optimizer:
         x_i        = start_indicator
         f_i, _, _  = self.evaluate(x_i)
         population = []
+        k, k_no_improve, x_i, f_i, population = self.restore("genetic_algorithm", k=k, k_no_improve=k_no_improve, x_i=x_i, f_i=f_i, population=population)
         
         while k < k_max:
             k = k +1
@@ -186,10 +519,13 @@ class Optimizer:
 
                     # mutation (neighbor solution)
                     x_j = self.random_neighbor(x_j, alpha)
-                    
-                f_j, _, _ = self.evaluate(x_j)
-                self.opt_local.append({"k": k, "score": f_j, "alpha": alpha, "params": x_j["ind_p"].copy()})
-                new_population.append({"x": x_j, "f": f_j})
+                new_population.append({"x": x_j})
+            
+            # evaluate whole generation at once
+            results = self.evaluate_batch([p["x"] for p in new_population])
+            for p, (f_j, _, _) in zip(new_population, results):
+                p["f"] = f_j
+                self.opt_local.add(k, f_j, p["x"]["ind_p"], alpha=alpha)
 
             population = new_population
             gen_best   = max(population, key=lambda p: p["f"])
@@ -201,25 +537,133 @@ class Optimizer:
             else:
                 k_no_improve += 1
 
-            self.opt_global.append({"k": k, "score": f_i, "alpha": alpha, "params": x_i["ind_p"].copy()})
-            self.log.write(f"k = {k}: x = {x_i} | f(x) = {f_i:.4f} | alpha = {alpha:.2f}\n")
+            self.opt_global.add(k, f_i, x_i["ind_p"], alpha=alpha)
+            self.trace.write({"algorithm": "genetic_algorithm", "k": k, "params": x_i["ind_p"].copy(), "score": f_i, "alpha": alpha})
+            self.checkpoint("genetic_algorithm", {"k": k, "k_no_improve": k_no_improve, "x_i": x_i, "f_i": f_i, "population": population}, k)
             if k_no_improve >= k_limit: break
 
-        self.log.flush()
+        self.trace.flush()
         return x_i, f_i
 
     def grid_search(self, start_indicator):
-        alpha = self.gs_cfg.get("alpha", 5)
-        grid  = [range(p["min"], p["max"]+1, alpha) for p in self.space["params"]]        
-        x_i   = start_indicator
-        k     = 0
-        
-        for params in itertools.product(*grid):
-            k = k+1       
-            x_i       = {"ind_t": start_indicator["ind_t"], "ind_p": list(params)}           
-            f_i, _, _ = self.evaluate(x_i)
-            self.opt_local.append({"k": k, "score": f_i, "T": None, "alpha": alpha, "params": x_i["ind_p"].copy()})
-            self.log.write(f"k = {k}: x = {x_i} | f(x) = {f_i:.4f}\n")
+        alpha  = self.gs_cfg.get("alpha", 5)
+        batch  = self.gs_cfg.get("batch_size", 1024)
+        grid   = [range(p["min"], p["max"]+1, alpha) for p in self.space["params"]]        
+        x_i    = start_indicator
+        k      = 0
+        f_i    = None
+        k, x_i, f_i = self.restore("grid_search", k=k, x_i=x_i, f_i=f_i)
+        points = itertools.islice(itertools.product(*grid), k, None)   # continue from grid position k
+        
+        # evaluate grid in vectorized chunks of batch_size candidates
+        for chunk in iter(lambda: list(itertools.islice(points, batch)), []):
+            population = [{"ind_t": start_indicator["ind_t"], "ind_p": list(params)} for params in chunk]
+            results    = self.evaluate_batch(population)
+            self.opt_local.extend(range(k +1, k +len(chunk) +1), [f for f, _, _ in results], chunk, alpha=alpha)
+            
+            for x_i, (f_i, _, _) in zip(population, results):
+                k = k+1
+                self.trace.write({"algorithm": "grid_search", "k": k, "params": x_i["ind_p"].copy(), "score": f_i})
+            self.checkpoint("grid_search", {"k": k, "x_i": x_i, "f_i": f_i}, -(-k//batch))     # every checkpoint_every chunks
             
         self.opt_global = self.opt_local
-        return x_i, f_i
\ No newline at end of file
+        return x_i, f_i
+
+    def bayesian_optimization(self, start_indicator, eps=1e-6, k_limit=10, k=0, k_no_improve=0):
+        n_init     = self.bo_cfg.get("n_init", 10)
+        batch      = self.bo_cfg.get("batch", 4)
+        k_max      = self.bo_cfg.get("k_max", 30)
+        n_cand     = self.bo_cfg.get("candidates", 2000)
+        max_points = self.bo_cfg.get("max_points", 300)
+        xi         = self.bo_cfg.get("xi", 0.01)
+        ind_t      = start_indicator["ind_t"]
+        low        = np.array([p["min"] for p in self.space["params"]])
+        high       = np.array([p["max"] for p in self.space["params"]])
+        span       = np.where(high > low, high -low, 1)
+        x_i        = start_indicator
+        f_i, _, _  = self.evaluate(x_i)
+        k, k_no_improve, x_i, f_i = self.restore("bayesian_optimization", k=k, k_no_improve=k_no_improve, x_i=x_i, f_i=f_i)
+
+        # initial design, evaluated in one batch
+        if k == 0:
+            design = self.sample(n_init)
+            for x_j, (f_j, _, _) in zip(design, self.evaluate_batch(design)):
+                self.opt_local.add(0, f_j, x_j["ind_p"])
+                if f_j > f_i +eps: x_i, f_i = x_j, f_j
+
+        while k < k_max:
+            k = k +1
+
+            # surrogate fitted on the evaluated points (best half and a random half when too many)
+            points = sorted((key for key, step in self.cache.entries.items() if key[0] == ind_t and math.isfinite(step["score"])), key=lambda key: self.cache.entries[key]["score"], reverse=True)
+            if len(points) > max_points: points = points[:max_points//2] +random.sample(points[max_points//2:], max_points -max_points//2)
+            X  = (np.array([key[1] for key in points]) -low)/span
+            y  = np.array([self.cache.entries[key]["score"] for key in points])
+            gp = GaussianProcess().fit(X, y)
+
+            # batch proposal: highest expected improvement, then the GP believes its own prediction (kriging believer)
+            candidates = list({tuple(x["ind_p"]): x for x in self.sample(n_cand) if (ind_t, tuple(x["ind_p"])) not in self.cache}.values())
+            if not candidates: break
+            Xc        = (np.array([x["ind_p"] for x in candidates]) -low)/span
+            proposals = []
+            for _ in range(min(batch, len(candidates))):
+                mu, sigma = gp.predict(Xc)
+                j         = int(np.argmax(GaussianProcess.expected_improvement(mu, sigma, y.max(), xi)))
+                proposals.append(candidates.pop(j))
+                gp.add(Xc[j], mu[j])
+                y         = np.append(y, mu[j])
+                Xc        = np.delete(Xc, j, axis=0)
+
+            # evaluate proposals at once
+            results = self.evaluate_batch(proposals)
+            f_best  = f_i
+            for x_j, (f_j, _, _) in zip(proposals, results):
+                self.opt_local.add(k, f_j, x_j["ind_p"])
+                if f_j > f_i +eps: x_i, f_i = x_j, f_j
+            k_no_improve = 0 if f_i > f_best else k_no_improve +1
+
+            self.opt_global.add(k, f_i, x_i["ind_p"])
+            self.trace.write({"algorithm": "bayesian_optimization", "k": k, "params": x_i["ind_p"].copy(), "score": f_i})
+            self.checkpoint("bayesian_optimization", {"k": k, "k_no_improve": k_no_improve, "x_i": x_i, "f_i": f_i}, k)
+            if k_no_improve >= k_limit: break
+
+        self.trace.flush()
+        return x_i, f_i
+
+    def successive_halving(self, start_indicator):
+        """
+        Multi-fidelity search: random candidates are scored on a short leading slice
+        of the history, the best 1/eta are promoted to an eta times longer slice and
+        only the finalists are backtested on the full history. With hyperband, the
+        brackets starting at every fidelity are run in turn.
+        """
+        n         = self.sh_cfg.get("n", 81)
+        eta       = self.sh_cfg.get("eta", 3)
+        s_max     = self.sh_cfg.get("rungs", 3) -1
+        brackets  = list(range(s_max, -1, -1)) if self.sh_cfg.get("hyperband", False) else [s_max]
+        x_i       = start_indicator
+        f_i, _, _ = self.evaluate(x_i)
+        b, k, x_i, f_i = self.restore("successive_halving", b=0, k=0, x_i=x_i, f_i=f_i)
+
+        for b, s in enumerate(brackets[b:], b):
+            # bracket s: n_s candidates starting at fidelity eta^-s (same budget per bracket)
+            n_s       = math.ceil(n*(s_max +1)/(s +1)/eta**(s_max -s))
+            survivors = list({tuple(x["ind_p"]): x for x in self.sample(n_s)}.values())
+
+            for r in range(s +1):
+                k        = k +1
+                fraction = eta**(r -s)
+                raw      = self.evaluate_fidelity(survivors, fraction)
+                scores   = np.nan_to_num(raw, nan=-np.inf)
+                order    = np.argsort(-scores, kind="stable")
+                if r == s: self.opt_local.extend([k]*len(survivors), raw, [x["ind_p"] for x in survivors])     # full history only (comparable scores)
+                self.trace.write({"algorithm": "successive_halving", "k": k, "bracket": s, "fraction": fraction, "candidates": len(survivors), "params": survivors[order[0]]["ind_p"].copy(), "score": float(scores[order[0]])})
+                survivors = [survivors[j] for j in order[:max(1, len(survivors)//eta)]]
+
+            if scores[order[0]] > f_i:
+                x_i, f_i = survivors[0], float(scores[order[0]])
+            self.opt_global.add(k, f_i, x_i["ind_p"])
+            self.checkpoint("successive_halving", {"b": b +1, "k": k, "x_i": x_i, "f_i": f_i}, b +1)
+
+        self.trace.flush()
+        return x_i, f_i
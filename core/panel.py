@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from .backtester import Backtester
+from .optimizer import Optimizer
+
+
+# =====================================================
+#  Panel
+# =====================================================
+class Panel:
+    """
+    Close/Volume of several tickers aligned on the union of their calendars.
+    For the backtest, the bars of each ticker are packed at the top of its column
+    (NaN padding below), so indicators and returns never span a missing bar.
+    parameters:
+    - raw_data: dictionary ticker -> dataframe with columns Close and Volume
+    """
+    def __init__(self, raw_data):
+        self.tickers = list(raw_data)
+        self.frame   = pd.concat({col: pd.concat({t: df[col] for t, df in raw_data.items()}, axis=1) for col in ["Close", "Volume"]}, axis=1).sort_index()
+        aligned      = self.frame["Close"].to_numpy(dtype=float)        # (n_dates, n_tickers), NaN where a ticker has no bar
+        valid        = ~np.isnan(aligned)
+        order        = np.argsort(~valid, axis=0, kind="stable")        # bars first, keeping date order
+        self.lengths = valid.sum(axis=0)
+        self.close   = np.take_along_axis(aligned, order, axis=0)
+        self.close   = np.asfortranarray(self.close[:max(self.lengths.max(initial=0), 1)])
+
+    @property
+    def n_bars(self):
+        return len(self.frame)
+
+
+# =====================================================
+#  Panel Optimizer
+# =====================================================
+class PanelOptimizer(Optimizer):
+    """
+    Optimizer of one parameter set over a whole panel: each candidate is backtested
+    on every ticker in one vectorized pass, and its score is the mean of the
+    ticker scores (the score is linear in the metrics, so it is the score of the
+    mean metrics)
+    """
+    def __init__(self, panel, search_space, file_config="config/config.json", resume=False):
+        super().__init__(panel.frame, search_space, file_config, ticker="panel", resume=resume)
+        self.panel   = panel
+        self.lean    = True         # no single dataframe to materialize
+        self.sweep   = False
+        self.result_path = ""
+
+    def evaluate_batch(self, indicators):
+        keys    = [(x["ind_t"], tuple(x["ind_p"])) for x in indicators]
+        pending = {}
+        for key, x in zip(keys, indicators):
+            if key not in pending and self.cache.get(key) is None: pending[key] = x
+
+        strategies = self.strategies
+        for key, x in pending.items():
+            metrics = Backtester.run_panel(self.panel.close, self.panel.lengths, key[0], list(key[1]), self.store)
+            self.record(key, x, None, {name: np.nanmean(values) for name, values in metrics.items()}, strategies)
+            self.data[-1]["tickers"] = metrics     # (n_tickers,) arrays, kept with the step (and its checkpoints)
+        return [self.cache[key] for key in keys]
+
+    def multi_start(self, name, cfg, start_indicator):
+        # single chain (the panel is not sent to worker processes)
+        return getattr(self, name)(start_indicator=start_indicator)
+
+    def evaluate_fidelity(self, indicators, fraction):
+        # leading fraction of the bars of every ticker
+        if fraction >= 1: return super().evaluate_fidelity(indicators, fraction)
+        lengths    = np.maximum(np.minimum(np.ceil(fraction*self.panel.lengths).astype(int), self.panel.lengths), 2)
+        strategies = self.strategies
+        scores     = []
+        for x in indicators:
+            metrics = Backtester.run_panel(self.panel.close, lengths, x["ind_t"], list(x["ind_p"]), self.store)
+            scores.append(strategies.compute_score({name: np.nanmean(values) for name, values in metrics.items()}))
+        return np.array(scores)
+
+    def best(self, n=None):
+        n = n if n is not None else self.top_n
+        return sorted(self.data, key=lambda step: step["score"], reverse=True)[:n]
+
+    def ranking(self, n=None):
+        """
+        Best candidates with their aggregate and per-ticker scores
+        returns:
+        - dataframe sorted by aggregate score (one Score_{ticker} column per ticker)
+        """
+        strategies = self.strategies
+        rows       = []
+        for step in self.best(n):
+            scores = strategies.compute_score(step["tickers"])
+            rows.append({
+                "Indicator": step["indicator"]["ind_t"],
+                "Parameters": step["indicator"]["ind_p"],
+                "Score": step["score"],
+                **step["metrics"],
+                **{f"Score_{ticker}": score for ticker, score in zip(self.panel.tickers, scores)},
+            })
+        return pd.DataFrame(rows)
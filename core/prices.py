@@ -0,0 +1,69 @@
+import os, shutil, tempfile
+import numpy as np
+import pandas as pd
+
+
+# dataframes attached by the current process (path -> (handle, read-only dataframe))
+ATTACHED = {}
+
+
+# =====================================================
+#  Price Registry
+# =====================================================
+class PriceRegistry:
+    """
+    Price data of a run written once as .npy files (one per column). Jobs receive
+    a small handle instead of the pickled dataframe and attach a read-only view
+    memory-mapped on the files, so every process shares the same pages.
+    parameters:
+    - folder: registry folder (a temporary folder removed by close() by default)
+    """
+    def __init__(self, folder=None):
+        self.owned   = folder is None
+        self.folder  = folder or tempfile.mkdtemp(prefix="tso_prices_")
+        self.handles = {}
+
+    def add(self, ticker, df):
+        """
+        Writes the columns and index of df
+        returns:
+        - handle (picklable dictionary) to pass to PriceRegistry.attach
+        """
+        path = os.path.join(self.folder, str(len(self.handles)))
+        os.makedirs(path, exist_ok=True)
+        index = pd.DatetimeIndex(df.index)
+        np.save(os.path.join(path, "index.npy"), index.asi8)     # UTC when tz-aware
+        for i, col in enumerate(df.columns):
+            np.save(os.path.join(path, f"{i}.npy"), np.ascontiguousarray(df[col].to_numpy()))
+        self.handles[ticker] = {"ticker": ticker, "path": path, "columns": list(df.columns), "index_name": df.index.name, "unit": index.unit, "tz": str(index.tz) if index.tz is not None else None}
+        return self.handles[ticker]
+
+    def __getitem__(self, ticker):
+        return self.handles[ticker]
+
+    @staticmethod
+    def attach(prices):
+        """
+        Read-only dataframe of a handle (a dataframe is returned as is), memory-mapped
+        once per process. Columns are not writable: derived frames add their own.
+        """
+        if isinstance(prices, pd.DataFrame): return prices
+        if prices["path"] not in ATTACHED:
+            path  = prices["path"]
+            index = pd.DatetimeIndex(np.load(os.path.join(path, "index.npy"), mmap_mode="r").view(f"M8[{prices['unit']}]"), name=prices["index_name"])
+            if prices["tz"] is not None: index = index.tz_localize("UTC").tz_convert(prices["tz"])
+            cols  = {col: np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r") for i, col in enumerate(prices["columns"])}
+            ATTACHED[path] = (prices, pd.DataFrame(cols, index=index, copy=False))
+        return ATTACHED[prices["path"]][1]
+
+    @staticmethod
+    def handle(df):
+        # handle of a dataframe attached in this process (the dataframe itself otherwise)
+        for prices, attached in ATTACHED.values():
+            if attached is df: return prices
+        return df
+
+    def close(self):
+        for handle in self.handles.values(): ATTACHED.pop(handle["path"], None)
+        if self.owned: shutil.rmtree(self.folder, ignore_errors=True)
+        self.handles = {}
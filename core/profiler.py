@@ -0,0 +1,150 @@
+import time, cProfile, tracemalloc
+from functools import wraps
+from contextlib import contextmanager, nullcontext
+from .config import RunConfig
+
+
+# =====================================================
+#  Profiler
+# =====================================================
+class Profiler:
+    """
+    Per-stage wall/CPU timers and counters of the current process. Stage times are
+    exclusive (time spent in nested stages is charged to them only). When disabled,
+    stage() returns a shared no-op context and counters return at once.
+    parameters (config "profile" section):
+    - enabled: record stages and counters
+    - memory: trace peak memory of every job (tracemalloc, slows allocations)
+    - cprofile: ticker whose jobs are also run under cProfile (.prof dump in data/results)
+    """
+    NULL = nullcontext()
+
+    def __init__(self):
+        self.enabled  = False
+        self.memory   = False
+        self.cprofile = ""
+        self.reset()
+
+    def load_config(self, path):
+        profile_cfg   = RunConfig.load(path).get("profile", {})
+        self.enabled  = profile_cfg.get("enabled", False)
+        self.memory   = self.enabled and profile_cfg.get("memory", False)
+        self.cprofile = profile_cfg.get("cprofile", "")
+
+    def reset(self):
+        self.stats = self.empty()
+        self.stack = []
+
+    @staticmethod
+    def empty():
+        return {"stages": {}, "counters": {}, "peak_mb": None}
+
+    def stage(self, name):
+        return self.timer(name) if self.enabled else self.NULL
+
+    @contextmanager
+    def timer(self, name):
+        frame = [time.perf_counter(), time.process_time(), 0.0, 0.0]   # start wall/cpu, nested wall/cpu
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            wall = time.perf_counter() -frame[0]
+            cpu  = time.process_time() -frame[1]
+            if self.stack:
+                self.stack[-1][2] += wall
+                self.stack[-1][3] += cpu
+            stage = self.stats["stages"].setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            stage["wall"]  += wall -frame[2]
+            stage["cpu"]   += cpu -frame[3]
+            stage["calls"] += 1
+
+    def timed(self, name):
+        # decorator version of stage()
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                with self.timer(name): return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, n=1):
+        if self.enabled: self.stats["counters"][name] = self.stats["counters"].get(name, 0) +n
+
+    @contextmanager
+    def scope(self):
+        """
+        Records the stages of a job apart from the process totals, yielding the
+        dictionary that receives them (picklable, returned to the parent process)
+        """
+        outer, stack = self.stats, self.stack
+        self.stats, self.stack = self.empty(), []
+        if self.memory:
+            if not tracemalloc.is_tracing(): tracemalloc.start()
+            tracemalloc.reset_peak()
+        try:
+            yield self.stats
+        finally:
+            if self.memory: self.stats["peak_mb"] = tracemalloc.get_traced_memory()[1]/1024**2
+            self.stats, self.stack = outer, stack
+
+    def run(self, path, fn, *args):
+        # runs fn under cProfile, dumping the statistics to path
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(fn, *args)
+        finally:
+            profile.dump_stats(path)
+
+    @staticmethod
+    def merge(total, stats):
+        # adds the stages/counters of stats to total (peak memory is the max)
+        for name, stage in stats["stages"].items():
+            acc = total["stages"].setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            for key in acc: acc[key] += stage[key]
+        for name, value in stats["counters"].items():
+            total["counters"][name] = total["counters"].get(name, 0) +value
+        if stats["peak_mb"] is not None: total["peak_mb"] = max(total["peak_mb"] or 0.0, stats["peak_mb"])
+        return total
+
+    def summary(self, tickers):
+        """
+        Structured summary of a run
+        parameters:
+        - tickers: dictionary ticker -> merged stats of its jobs
+        returns:
+        - dictionary with stage totals (this process and every job) and per ticker
+          throughput, cache hit rate and peak memory
+        """
+        total   = self.merge(self.empty(), self.stats)
+        summary = {"stages": total["stages"], "tickers": {}}
+        for ticker, stats in tickers.items():
+            self.merge(total, stats)
+            counters = stats["counters"]
+            wall     = sum(stage["wall"] for stage in stats["stages"].values())   # stages are exclusive
+            lookups  = counters.get("cache_hits", 0) +counters.get("cache_misses", 0)
+            summary["tickers"][ticker] = {
+                "evaluations": counters.get("evaluations", 0),
+                "evals_per_sec": counters.get("evaluations", 0)/wall if wall else 0.0,
+                "cache_hit_rate": counters.get("cache_hits", 0)/lookups if lookups else 0.0,
+                "peak_mb": stats["peak_mb"],
+            }
+        summary["counters"] = total["counters"]
+        return summary
+
+    @staticmethod
+    def report(summary):
+        # summary as log lines
+        lines = ["Profile (stage: wall / cpu / calls):"]
+        for name, stage in sorted(summary["stages"].items(), key=lambda item: -item[1]["wall"]):
+            lines.append(f"  {name:<14} {stage['wall']:>9.3f}s {stage['cpu']:>9.3f}s {stage['calls']:>8}")
+        for ticker, stats in summary["tickers"].items():
+            peak = f"{stats['peak_mb']:.1f} MB" if stats["peak_mb"] is not None else "-"
+            lines.append(f"  {ticker}: {stats['evaluations']} evaluations, {stats['evals_per_sec']:.1f} evals/s, cache hit rate {stats['cache_hit_rate']:.1%}, peak memory {peak}")
+        return lines
+
+
+# profiler of the current process (configured by run_tso and by each job)
+PROFILER = Profiler()
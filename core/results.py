@@ -0,0 +1,116 @@
+import os, json, pickle, sqlite3, hashlib
+import numpy as np
+
+
+# =====================================================
+#  Result Store
+# =====================================================
+class ResultStore:
+    """
+    Persistent evaluation store (SQLite) shared across runs, keyed by
+    (ticker, data fingerprint, indicator, parameters, backtest version), with the
+    streaming backtest state of each (ticker, indicator space)
+    """
+    METRICS = ["Return_Market", "Return_Strategy", "Trades", "Sharpe", "Max_Drawdown"]
+    DIGEST  = 20        # characters of the data fingerprint (walk-forward folds append their bars)
+
+    def __init__(self, path="data/evaluations.sqlite", buffer=1000):
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.buffer = buffer
+        self.rows   = []
+        self.conn   = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "ticker TEXT, fingerprint TEXT, ind_t TEXT, params TEXT, version INTEGER, "
+            "start TEXT, end TEXT, created REAL DEFAULT (julianday('now')), "
+            +", ".join(f"{m} REAL" for m in self.METRICS)+", "
+            "PRIMARY KEY (ticker, fingerprint, ind_t, params, version))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS evaluations_created ON evaluations (ticker, created)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS streams ("
+            "ticker TEXT, space TEXT, version INTEGER, fingerprint TEXT, state BLOB, "
+            "PRIMARY KEY (ticker, space, version))"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def fingerprint(df):
+        # hash of dates and Close/Volume values (changes whenever the price data changes)
+        h = hashlib.sha1()
+        h.update(np.ascontiguousarray(df.index.values.astype("datetime64[ns]")).tobytes())
+        for col in ["Close", "Volume"]: h.update(np.ascontiguousarray(df[col].to_numpy(dtype=float)).tobytes())
+        return h.hexdigest()[:ResultStore.DIGEST]
+
+    def load(self, ticker, fingerprint, ind_t, version, start=None, end=None):
+        # stored metrics of a (ticker, data, indicator) as {params: metrics}, backtested on start..end when given
+        self.flush()
+        query = (f"SELECT params, {', '.join(self.METRICS)} FROM evaluations "
+                 "WHERE ticker = ? AND fingerprint = ? AND ind_t = ? AND version = ?")
+        args  = [ticker, fingerprint, ind_t, version]
+        for name, value in [("start", start), ("end", end)]:
+            if value is None: continue
+            query += f" AND {name} = ?"
+            args.append(value)
+        cursor = self.conn.execute(query, args)
+        return {tuple(json.loads(row[0])): self.metrics(row[1:]) for row in cursor}
+
+    def add(self, ticker, fingerprint, ind_t, params, version, metrics, start=None, end=None):
+        self.rows.append((ticker, fingerprint, ind_t, json.dumps(list(params)), version, start, end,
+                          *[float(metrics[m]) for m in self.METRICS]))
+        if len(self.rows) >= self.buffer: self.flush()
+
+    def flush(self):
+        if not self.rows: return
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO evaluations (ticker, fingerprint, ind_t, params, version, start, end, {', '.join(self.METRICS)}) "
+            f"VALUES ({', '.join('?'*(7 +len(self.METRICS)))})",
+            self.rows,
+        )
+        self.conn.commit()
+        self.rows = []
+
+    def res_data(self, tickers=None, version=None):
+        """
+        Stored metrics of the most recent price data of each ticker (every walk-forward
+        fold of it, labels end with the fold bars), in the res_data shape expected by
+        Strategies.best_strategy (no price data needed)
+        """
+        self.flush()
+        where = "" if version is None else "WHERE version = ?"
+        query = (f"SELECT e.ticker, e.fingerprint, e.ind_t, e.params, {', '.join('e.' +m for m in self.METRICS)} FROM evaluations e "
+                 f"JOIN (SELECT ticker, fingerprint, MAX(created) FROM evaluations {where} GROUP BY ticker) latest "
+                 f"ON e.ticker = latest.ticker AND substr(e.fingerprint, 1, {self.DIGEST}) = substr(latest.fingerprint, 1, {self.DIGEST})")
+        args  = [] if version is None else [version, version]
+        if version is not None: query += " WHERE e.version = ?"
+
+        res_data = {}
+        for ticker, fingerprint, ind_t, params, *values in self.conn.execute(query, args):
+            if tickers is not None and ticker not in tickers: continue
+            ind_p = json.loads(params)
+            label = f"{ticker}_{ind_t}_{'_'.join(str(p) for p in ind_p)}{fingerprint[self.DIGEST:]}"
+            res_data.setdefault(ticker, {})[label] = {"Indicator": ind_t, "Parameters": ind_p, **self.metrics(values)}
+        return res_data
+
+    def load_stream(self, ticker, space, version):
+        # (fingerprint of the bars streamed, IncrementalBacktest) of a space, None when missing
+        row = self.conn.execute("SELECT fingerprint, state FROM streams WHERE ticker = ? AND space = ? AND version = ?", (ticker, space, version)).fetchone()
+        return None if row is None else (row[0], pickle.loads(row[1]))
+
+    def save_stream(self, ticker, space, version, fingerprint, stream):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO streams (ticker, space, version, fingerprint, state) VALUES (?, ?, ?, ?, ?)",
+            (ticker, space, version, fingerprint, pickle.dumps(stream, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self.conn.commit()
+
+    def metrics(self, values):
+        # NaN metrics are stored as NULL
+        metrics = {m: float("nan") if v is None else v for m, v in zip(self.METRICS, values)}
+        metrics["Trades"] = int(metrics["Trades"])
+        return metrics
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor
+from .indicator import IndicatorStore
+from .optimizer import Optimizer
+from .walkforward import WalkForward
+from .panel import PanelOptimizer
+from .profiler import PROFILER
+from .prices import PriceRegistry
+from .results import ResultStore
+
+
+# indicator store of the current process (shared by consecutive jobs of the same ticker and data)
+STORE = {"key": None, "store": IndicatorStore()}
+
+
+def process_store(ticker, df):
+    # cleared whenever the ticker or its price data changes (new run, retry, refreshed download)
+    key = (ticker, ResultStore.fingerprint(df))
+    if STORE["key"] != key:
+        STORE["key"] = key
+        STORE["store"].clear()
+    return STORE["store"]
+
+
+def optimize_job(ticker, prices, search_space, file_config="config/config.json", resume=False):
+    """
+    Runs one (ticker, indicator space) optimization on the price data of a
+    registry handle (or dataframe), returning compact metrics and traces
+    (dataframes are rebuilt by the caller on demand)
+    """
+    PROFILER.load_config(file_config)
+    with PROFILER.scope() as profile:
+        df           = PriceRegistry.attach(prices)
+        optimization = Optimizer(df, search_space, file_config, store=process_store(ticker, df), ticker=ticker, resume=resume)
+        with PROFILER.stage("search"):
+            if PROFILER.cprofile == ticker: steps = PROFILER.run(f"data/results/{ticker}_{search_space['ind_t']}.prof", optimization.search)
+            else: steps = optimization.search()
+        PROFILER.count("cache_hits", optimization.cache.hits)
+        PROFILER.count("cache_misses", optimization.cache.misses)
+    return {
+        "steps": [{"indicator": s["indicator"], "df": None, "metrics": s["metrics"], "score": s["score"]} for s in steps],
+        "opt_global": optimization.opt_global,
+        "opt_local": optimization.opt_local,
+        "profile": profile,
+    }
+
+
+def walk_forward_job(ticker, prices, search_space, fold, wf_cfg, file_config="config/config.json"):
+    """
+    Runs one walk-forward fold, returning its in-sample and out-of-sample metrics
+    (folds of the same ticker in a process share the indicator store)
+    """
+    df           = PriceRegistry.attach(prices)
+    walk_forward = WalkForward(df, search_space, wf_cfg["train"], wf_cfg["test"], wf_cfg["step"], file_config, process_store(ticker, df), ticker)
+    return walk_forward.run_fold(fold)
+
+
+def panel_job(panel, search_space, file_config="config/config.json", resume=False):
+    """
+    Runs one indicator space optimization over a whole panel of tickers,
+    returning the ranking of its best candidates
+    """
+    optimization = PanelOptimizer(panel, search_space, file_config, resume=resume)
+    optimization.search()
+    return optimization.ranking()
+
+
+# =====================================================
+#  Runner
+# =====================================================
+class Runner:
+    def __init__(self, workers=1):
+        self.workers = max(1, int(workers))
+
+    def run(self, fn, jobs):
+        """
+        Runs fn(*job) for every job (in a process pool if workers > 1)
+        yields:
+        - (job, result, error) in submission order, error is None on success
+          and a failing job does not abort the others
+        """
+        if self.workers == 1:
+            for job in jobs:
+                try:
+                    yield job, fn(*job), None
+                except Exception as err:
+                    yield job, None, err
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(fn, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    yield job, future.result(), None
+                except Exception as err:
+                    yield job, None, err
@@ -1,5 +1,6 @@
-import json
+import numpy as np
 import pandas as pd
+from .config import RunConfig, PRESETS
 
 
 # =====================================================
@@ -10,30 +11,26 @@ class Strategies:
         self.load_config(file_config)
 
     def load_config(self, path):
-        with open(path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            self.preset  = config.get("preset", "basic")
-            self.weights = config.get("weights", {}) 
+        config = RunConfig.load(path)
+        self.preset        = config.preset
+        self.weights       = config.get("weights", {})
+        self.score_weights = config.weights     # weights of the preset (resolved once per run)
             
     def get_weights(self, **override):
-        base = self.PRESET.get(self.preset, {}).copy()
-        if self.preset == "custom": base.update(self.weights)
-        base.update(override)
-        return base
+        return {**self.score_weights, **override}
             
-    PRESET = {
-        "basic":     {"w_return": 1.0, "w_trades": 0.02, "w_sharpe": 0, "w_drdown": 0},
-        "balanced":  {"w_return": 1.0, "w_trades": 0.04, "w_sharpe": 0.01, "w_drdown": 0.05},
-        "agressive": {"w_return": 1.0, "w_trades": 0, "w_sharpe": 0.02, "w_drdown": 0},
-        "defensive": {"w_return": 1.0, "w_trades": 0.05, "w_sharpe": 0, "w_drdown": 0.05},
-        "custom":    {}
-    }
+    PRESET = PRESETS
+    
+    # score = metrics @ (SIGNS*weights), metrics and weights in this order
+    METRICS = ["Return_Strategy", "Trades", "Sharpe", "Max_Drawdown"]
+    WEIGHTS = ["w_return", "w_trades", "w_sharpe", "w_drdown"]
+    SIGNS   = np.array([1, -1, 1, -1])
                
     def compute_score(self, metrics: dict, **weights) -> float:
         """
         Computes strategy score for a single evaluation
         """
-        params   = {**self.PRESET.get(self.preset, {}),**(self.weights if self.preset == "custom" else {}),**weights}
+        params   = {**self.score_weights, **weights} if weights else self.score_weights
         w_return = params["w_return"]
         w_trades = params["w_trades"]
         w_sharpe = params["w_sharpe"]
@@ -46,7 +43,7 @@ class Strategies:
         """
         bst_data = {}
 
-        params   = {**self.PRESET.get(self.preset, {}),**(self.weights if self.preset == "custom" else {}),**weights}
+        params   = self.get_weights(**weights)
         w_return = params["w_return"]
         w_trades = params["w_trades"]
         w_sharpe = params["w_sharpe"]
@@ -65,6 +62,78 @@ class Strategies:
             bst_data[ticker] = df.sort_values("Score", ascending=False)
         return bst_data
     
+    def rescore(self, store, tickers=None, **weights):
+        """
+        Re-scores evaluations kept in a ResultStore (no price data or backtest needed)
+        """
+        return self.best_strategy(store.res_data(tickers), **weights)
+    
+    def preset_weights(self):
+        # weights of every preset ("custom" is the config weights, skipped if incomplete)
+        weight_sets = {name: {**preset, **(self.weights if name == "custom" else {})} for name, preset in self.PRESET.items()}
+        return {name: weights for name, weights in weight_sets.items() if all(w in weights for w in self.WEIGHTS)}
+    
+    def weight_matrix(self, weight_sets):
+        """
+        parameters:
+        - weight_sets: dictionary name -> weights, as a dictionary (w_return, w_trades,
+          w_sharpe, w_drdown) or a sequence in that order
+        returns:
+        - array (4, n_sets) such that metrics @ matrix gives the scores
+        """
+        rows = [[weights[w] for w in self.WEIGHTS] if isinstance(weights, dict) else list(weights) for weights in weight_sets.values()]
+        return np.array(rows, dtype=float).reshape(-1, len(self.WEIGHTS)).T*self.SIGNS[:, None]
+    
+    def score_matrix(self, metrics, weight_sets=None):
+        """
+        Scores of every evaluation under every weight set in one matrix product
+        parameters:
+        - metrics: dataframe with the METRICS columns (or array (N, 4) in that order)
+        - weight_sets: see weight_matrix (every preset by default)
+        returns:
+        - dataframe (N, n_sets) with one score column per weight set
+        """
+        weight_sets = weight_sets if weight_sets is not None else self.preset_weights()
+        matrix      = metrics[self.METRICS].to_numpy(dtype=float) if isinstance(metrics, pd.DataFrame) else np.asarray(metrics, dtype=float)
+        index       = metrics.index if isinstance(metrics, pd.DataFrame) else None
+        return pd.DataFrame(matrix @ self.weight_matrix(weight_sets), index=index, columns=list(weight_sets))
+    
+    def rank_all(self, res_data, weight_sets=None, n=None):
+        """
+        Rankings of the evaluations of every ticker under every weight set (each
+        ticker's metrics are scored once for all sets)
+        returns:
+        - dictionary name -> {ticker: dataframe sorted by Score (best n rows)}, the
+          shape returned by best_strategy for one weight set
+        """
+        weight_sets = weight_sets if weight_sets is not None else self.preset_weights()
+        rankings    = {name: {} for name in weight_sets}
+        for ticker, ticker_results in res_data.items():
+            df     = pd.DataFrame.from_dict(ticker_results, orient="index")
+            scores = self.score_matrix(df, weight_sets).to_numpy()
+            for j, name in enumerate(weight_sets):
+                order = np.argsort(-scores[:, j], kind="stable")[:n]      # NaN scores last
+                rankings[name][ticker] = df.iloc[order].assign(Score=scores[order, j])
+        return rankings
+    
+    @staticmethod
+    def best_by_preset(rankings):
+        # best strategy of every (weight set, ticker) as one table
+        rows = []
+        for name, bst_data in rankings.items():
+            for ticker, bst_df in bst_data.items():
+                if bst_df.empty: continue
+                row = bst_df.iloc[0]
+                rows.append({"Preset": name, "Ticker": ticker, "Indicator": row["Indicator"], "Parameters": row["Parameters"], "Score": row["Score"]})
+        return pd.DataFrame(rows)
+    
+    def rescore_all(self, store, tickers=None, weight_sets=None, n=None):
+        """
+        rank_all of the evaluations kept in a ResultStore (weight sensitivity of
+        past searches, no backtest needed)
+        """
+        return self.rank_all(store.res_data(tickers), weight_sets, n)
+    
     def import_strategies(self, csv_file):
         # import strategies
         strategies = pd.read_csv(csv_file).set_index("Ticker").to_dict("index")
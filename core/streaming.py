@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from .indicator import Indicator
+from .backtester import Backtester
+
+
+# =====================================================
+#  Incremental Backtest
+# =====================================================
+class IncrementalBacktest:
+    """
+    Streaming backtest state of N candidates (same ind_t), advanced bar by bar in
+    O(new bars). Holds the EMA/MACD recursion state, the rolling window buffer,
+    current position, cumulative returns, running max and trade count, following
+    the same rules as Backtester.run_strategy. Built from a batch backtest of the
+    history (from_history), persisted in the ResultStore and extended with new
+    candidates by merge()
+    parameters:
+    - ind_t: str with indicator name
+    - param_matrix: array (N, n_params) with one parameter vector per row
+    """
+    def __init__(self, ind_t, param_matrix):
+        self.ind_t  = ind_t
+        self.params = np.atleast_2d(np.asarray(param_matrix))
+        N           = len(self.params)
+
+        # indicator state
+        self.buffer = deque(maxlen=self.window())
+        self.ema    = {}                            # span -> current EMA value
+        self.macd   = None                          # current MACD signal line (N,)
+
+        # backtest state
+        self.n            = 0                       # processed bars
+        self.last_close   = np.nan
+        self.signal       = np.zeros(N)             # signal of the previous bar
+        self.position     = np.full(N, np.nan)      # position of the previous bar
+        self.cum_market   = 1.0
+        self.cum_strategy = np.ones(N)
+        self.peak         = np.ones(N)              # running max of cumulative strategy
+        self.max_drawdown = np.zeros(N)
+        self.trades       = np.zeros(N, dtype=int)
+        self.mean         = np.zeros(N)             # running mean/variance of strategy (Welford)
+        self.m2           = np.zeros(N)
+
+    @classmethod
+    def from_history(cls, close, volume, ind_t, param_matrix, store=None, ticker=None, max_bytes=None):
+        """
+        State after the whole history, from vectorized batch backtests (chunks of
+        at most max_bytes) instead of stepping every bar
+        parameters:
+        - close, volume: series (or arrays) with the history
+        - store, ticker: indicator store shared with the batch backtests (optional)
+        """
+        stream = cls(ind_t, param_matrix)
+        close  = np.asarray(close, dtype=float)
+        if len(close) == 0: return stream
+        n      = len(stream.params)
+        if max_bytes: n = max(1, int(max_bytes//(16*Backtester.ARRAYS*len(close))))
+        for i in range(0, len(stream.params), n):
+            rows = slice(i, i +n)
+            arrays, metrics = Backtester.run_batch(close, volume, ind_t, stream.params[rows], store, ticker)
+            stream.signal[rows]       = arrays["Signal"][-1]
+            stream.position[rows]     = arrays["Position"][-1]
+            stream.cum_strategy[rows] = arrays["Cumulative_Strategy"][-1]
+            stream.peak[rows]         = np.maximum(arrays["Cumulative_Strategy"].max(axis=0), 1)
+            stream.max_drawdown[rows] = metrics["Max_Drawdown"]
+            stream.trades[rows]       = arrays["Cumulative_Trades"][-1]
+            stream.mean[rows]         = arrays["Strategy"].mean(axis=0)
+            stream.m2[rows]           = ((arrays["Strategy"] -stream.mean[rows])**2).sum(axis=0)
+            if ind_t == "MACD":
+                if stream.macd is None: stream.macd = np.zeros(len(stream.params))
+                stream.macd[rows] = arrays["MACD_Signal"][-1]
+
+        # recursion and window state of the last bar
+        memo = Indicator({}, store, ticker).memo
+        if ind_t in ["EMA", "MACD"]:
+            spans = np.unique(stream.params if ind_t == "EMA" else stream.params[:, :2])
+            stream.ema = {int(w): float(memo(Indicator.ema, pd.Series(close), int(w))[-1]) for w in spans}
+        stream.buffer.extend(close[-stream.buffer.maxlen:])
+        stream.n          = len(close)
+        stream.last_close = close[-1]
+        stream.cum_market = float(np.nancumprod(1 +(close[1:]/close[:-1] -1))[-1]) if len(close) > 1 else 1.0
+        return stream
+
+    def window(self):
+        # closes kept for the rolling indicators
+        windows = self.params[:, 0] if self.ind_t == "BB" else self.params
+        return int(windows.max()) if self.ind_t in ["SMA", "WMA", "BB"] else 1
+
+    def keys(self):
+        # parameters of every candidate (as tuples)
+        return [tuple(int(p) for p in params) for params in self.params]
+
+    def merge(self, other):
+        """
+        Appends the candidates of another state advanced over the same bars
+        (same ind_t and number of parameters)
+        """
+        if other.n != self.n: raise ValueError(f"Cannot merge streams at bars {self.n} and {other.n}.")
+        for name in ["params", "signal", "position", "cum_strategy", "peak", "max_drawdown", "trades", "mean", "m2"]:
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        if self.macd is not None or other.macd is not None: self.macd = np.concatenate([self.macd, other.macd])
+        self.ema    = {**self.ema, **other.ema}
+        self.buffer = self.buffer if self.buffer.maxlen >= other.buffer.maxlen else other.buffer
+        return self
+
+    @staticmethod
+    def ewm_step(y, x, span):
+        # one step of ewm(span, adjust=False), same arithmetic as pandas
+        alpha = 1.0/(1.0 +(span -1)/2.0)
+        old   = 1.0 -alpha
+        return np.where(y != x, (old*y +alpha*x)/(old +alpha), y)
+
+    def update_ema(self, close, span):
+        span = int(span)
+        self.ema[span] = close if span not in self.ema else float(self.ewm_step(self.ema[span], close, span))
+        return self.ema[span]
+
+    def rolling(self, window, kind):
+        # rolling mean/weighted mean/std of the last window closes (NaN while not enough bars)
+        if len(self.buffer) < window: return np.nan
+        hist = np.fromiter(self.buffer, dtype=float, count=len(self.buffer))[-window:]
+        if kind == "sma": return hist.mean()
+        if kind == "wma": return hist @ np.arange(1, window +1)/(window*(window +1)/2)
+        return hist.std(ddof=1) if window > 1 else np.nan
+
+    def indicators(self, close):
+        # indicator values of the current bar for every candidate
+        if self.ind_t in ["SMA", "WMA", "EMA"]:
+            kind   = self.ind_t.lower()
+            values = {}
+            for w in np.unique(self.params):
+                values[w] = self.update_ema(close, w) if kind == "ema" else self.rolling(int(w), kind)
+            names = {1: ["Short"], 2: ["Short", "Long"], 3: ["Short", "Mid", "Long"]}[self.params.shape[1]]
+            return {name: np.array([values[w] for w in self.params[:, i]]) for i, name in enumerate(names)}
+        elif self.ind_t == "BB":
+            middle = np.array([self.rolling(int(w), "sma") for w in self.params[:, 0]])
+            std    = np.array([self.rolling(int(w), "rolling_std") for w in self.params[:, 0]])
+            return {"BB_Upper": middle +self.params[:, 1]*std, "BB_Lower": middle -self.params[:, 1]*std}
+        elif self.ind_t == "MACD":
+            emas      = {w: self.update_ema(close, w) for w in np.unique(self.params[:, :2])}
+            macd_line = np.array([emas[f] -emas[s] for f, s in self.params[:, :2]])
+            self.macd = macd_line if self.macd is None else self.ewm_step(self.macd, macd_line, self.params[:, 2])
+            return {"MACD": macd_line, "MACD_Signal": self.macd}
+        raise ValueError(f"Unsupported indicator: {self.ind_t}.")
+
+    def step(self, close):
+        # simulate execution with the signal of the previous bar
+        position = np.where(self.signal == 1, 1.0, 0.0) if self.n > 0 else np.full(len(self.params), np.nan)
+        ret      = close/self.last_close -1 if self.n > 0 else np.nan
+        if self.n > 1: self.trades += (position == 1) & (self.position == 0)
+        strategy = position*ret
+        strategy[np.isnan(strategy)] = 0.00001
+
+        # cumulative returns and drawdown
+        if self.n > 0: self.cum_market *= 1 +ret
+        self.cum_strategy *= 1 +strategy
+        self.peak          = np.maximum(self.peak, self.cum_strategy)
+        self.max_drawdown  = np.maximum(self.max_drawdown, -(self.cum_strategy -self.peak)/self.peak)
+        delta              = strategy -self.mean
+        self.mean         += delta/(self.n +1)
+        self.m2           += delta*(strategy -self.mean)
+
+        # signal of the current bar
+        self.buffer.append(close)
+        self.signal     = Backtester.signals(self.ind_t, close, self.indicators(close), self.params.shape[1])
+        self.position   = position
+        self.last_close = close
+        self.n         += 1
+
+    def advance(self, close):
+        # advance by one or more new bars
+        for c in np.atleast_1d(np.asarray(close, dtype=float)): self.step(c)
+        return self
+
+    def metrics(self):
+        # metrics of every candidate, as Backtester.run_batch
+        N = len(self.params)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = self.mean/np.sqrt(self.m2/(self.n -1))*pow(self.n, 0.5)
+        return {
+            "Return_Market": np.full(N, self.cum_market if self.n > 1 else np.nan),
+            "Return_Strategy": self.cum_strategy.copy(),
+            "Trades": self.trades.copy(),
+            "Sharpe": sharpe,
+            "Max_Drawdown": self.max_drawdown.copy(),
+        }
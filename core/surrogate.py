@@ -0,0 +1,95 @@
+import math
+import numpy as np
+try:
+    from scipy.linalg import solve_triangular
+except ImportError:         # NumPy fallback: general solve on the triangular factor
+    solve_triangular = None
+
+
+def tri_solve(L, b, trans=False):
+    # solves L x = b (L.T x = b when trans) for a lower triangular L
+    if solve_triangular is not None: return solve_triangular(L, b, lower=True, trans=int(trans), check_finite=False)
+    return np.linalg.solve(L.T if trans else L, b)
+
+
+# =====================================================
+#  Gaussian Process
+# =====================================================
+class GaussianProcess:
+    """
+    Gaussian process regression (RBF kernel) used as surrogate of the score. Inputs
+    are scaled to [0, 1] by the caller, targets are standardized here and the length
+    scale is picked by marginal likelihood; add() extends a fit with fixed
+    hyperparameters by a rank-1 update of the Cholesky factor
+    parameters:
+    - noise: observation noise (relative to the target variance)
+    - scales: candidate length scales
+    """
+    def __init__(self, noise=1e-4, scales=(0.05, 0.1, 0.2, 0.4)):
+        self.noise  = noise
+        self.scales = scales
+
+    @staticmethod
+    def kernel(A, B, scale):
+        d2 = np.sum(A**2, axis=1)[:, None] +np.sum(B**2, axis=1)[None, :] -2*A @ B.T
+        return np.exp(-0.5*np.maximum(d2, 0)/scale**2)
+
+    def fit(self, X, y):
+        self.X    = np.asarray(X, dtype=float)
+        y         = np.asarray(y, dtype=float)
+        self.mean = y.mean()
+        self.std  = y.std() or 1.0
+        z         = (y -self.mean)/self.std
+
+        # length scale with the highest log marginal likelihood
+        best = None
+        for scale in self.scales:
+            K = self.kernel(self.X, self.X, scale) +self.noise*np.eye(len(self.X))
+            try:
+                L = np.linalg.cholesky(K)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = tri_solve(L, tri_solve(L, z), trans=True)
+            lml   = -0.5*z @ alpha -np.log(np.diag(L)).sum()
+            if best is None or lml > best[0]: best = (lml, scale, L, alpha)
+        if best is None: raise RuntimeError("Gaussian process fit failed (singular kernel).")
+        _, self.scale, self.L, self.alpha = best
+        self.z = z
+        return self
+
+    def add(self, x, y):
+        """
+        Adds one observation keeping the length scale and the target standardization
+        (bordered Cholesky: O(n^2) instead of a refit)
+        """
+        x = np.asarray(x, dtype=float)[None, :]
+        k = self.kernel(x, self.X, self.scale)[0]
+        l = tri_solve(self.L, k)
+        d = math.sqrt(max(1.0 +self.noise -l @ l, 1e-12))
+        n = len(self.X)
+        L = np.zeros((n +1, n +1))
+        L[:n, :n] = self.L
+        L[n, :n]  = l
+        L[n, n]   = d
+        self.X     = np.vstack([self.X, x])
+        self.z     = np.append(self.z, (y -self.mean)/self.std)
+        self.L     = L
+        self.alpha = tri_solve(L, tri_solve(L, self.z), trans=True)
+        return self
+
+    def predict(self, X):
+        # posterior mean and standard deviation (in score units)
+        Ks    = self.kernel(np.asarray(X, dtype=float), self.X, self.scale)
+        v     = tri_solve(self.L, Ks.T)
+        mu    = Ks @ self.alpha
+        sigma = np.sqrt(np.maximum(1.0 -np.sum(v**2, axis=0), 1e-12))
+        return self.mean +self.std*mu, self.std*sigma
+
+    @staticmethod
+    def expected_improvement(mu, sigma, best, xi=0.01):
+        # expected improvement over best (maximization)
+        imp = mu -best -xi
+        z   = imp/sigma
+        cdf = 0.5*(1 +np.vectorize(math.erf)(z/math.sqrt(2)))
+        pdf = np.exp(-0.5*z**2)/math.sqrt(2*math.pi)
+        return imp*cdf +sigma*pdf
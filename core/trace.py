@@ -0,0 +1,117 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+#  Trace Writer
+# =====================================================
+class TraceWriter:
+    """
+    Buffered JSON lines trace of a search, one file per (ticker, indicator) run,
+    so parallel workers never share a file
+    parameters:
+    - path: output file
+    - sample: keeps one of every sample records (1 keeps all, 0 disables the trace)
+    - buffer: records kept in memory between writes
+    - append: continue an existing trace (resumed runs)
+    """
+    def __init__(self, path, sample=1, buffer=1000, append=False):
+        self.path    = path
+        self.sample  = sample
+        self.buffer  = max(1, buffer)
+        self.records = []
+        self.n       = 0
+        if sample and not append: open(path, "w").close()
+
+    def write(self, record):
+        self.n += 1
+        if not self.sample or (self.n -1) % self.sample: return
+        self.records.append(record)
+        if len(self.records) >= self.buffer: self.flush()
+
+    def flush(self):
+        # one write call per batch of records
+        if not self.records: return
+        lines = "".join(json.dumps(record, default=lambda value: value.item()) +"\n" for record in self.records)
+        with open(self.path, "a", encoding="utf-8") as f: f.write(lines)
+        self.records = []
+
+    def close(self):
+        self.flush()
+
+    @staticmethod
+    def read(path):
+        return pd.read_json(path, lines=True)
+
+
+# =====================================================
+#  Optimization Trace
+# =====================================================
+class OptTrace:
+    """
+    Optimization trace (opt_local/opt_global) in a growable NumPy structured array,
+    one row per point (k, score, T, alpha, params[n_params]). Reads as the former
+    list of dicts (len, iteration, trace[i]["score"]) and by column (trace["score"])
+    parameters:
+    - n_params: number of indicator parameters
+    - capacity: rows preallocated (doubled when full)
+    """
+    def __init__(self, n_params, capacity=1024):
+        self.rows = np.zeros(capacity, dtype=[("k", "i8"), ("score", "f8"), ("T", "f8"), ("alpha", "f8"), ("params", "i8", (n_params,))])
+        self.n    = 0
+
+    def reserve(self, n):
+        # grow capacity to fit n more rows
+        if self.n +n <= len(self.rows): return
+        rows = np.zeros(max(2*len(self.rows), self.n +n), dtype=self.rows.dtype)
+        rows[:self.n] = self.rows[:self.n]
+        self.rows = rows
+
+    def add(self, k, score, params, T=None, alpha=None):
+        self.reserve(1)
+        self.rows[self.n] = (k, score, np.nan if T is None else T, np.nan if alpha is None else alpha, params)
+        self.n += 1
+
+    def append(self, record):
+        self.add(record["k"], record["score"], record["params"], record.get("T"), record.get("alpha"))
+
+    def extend(self, k, score, params, T=None, alpha=None):
+        # appends a batch of points (arrays with one entry per point)
+        n = len(k)
+        self.reserve(n)
+        rows = self.rows[self.n:self.n +n]
+        rows["k"], rows["score"], rows["params"] = k, score, params
+        rows["T"]     = np.nan if T is None else T
+        rows["alpha"] = np.nan if alpha is None else alpha
+        self.n += n
+
+    def merge(self, other):
+        # appends every point of another trace
+        self.extend(other["k"], other["score"], other["params"], other["T"], other["alpha"])
+
+    @property
+    def data(self):
+        return self.rows[:self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        # column (view) by name, record (dict) by position
+        if isinstance(key, str): return self.data[key]
+        row = self.data[key]
+        return {
+            "k": int(row["k"]),
+            "score": float(row["score"]),
+            "T": None if np.isnan(row["T"]) else float(row["T"]),
+            "alpha": None if np.isnan(row["alpha"]) else float(row["alpha"]),
+            "params": row["params"].tolist(),
+        }
+
+    def __iter__(self):
+        return (self[i] for i in range(self.n))
+
+    def __getstate__(self):
+        # pickle the filled rows only
+        return {"rows": self.data.copy(), "n": self.n}
@@ -1,15 +1,42 @@
+import numpy as np
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
+from concurrent.futures import ProcessPoolExecutor
+from .config import RunConfig
 
 
 # =====================================================
 #  Visualizer
 # =====================================================
 class Visualizer:
-    def __init__(self, df):
-        self.df     = df
+    def __init__(self, df, dpi=300, max_points=None):
+        self.df     = self.decimate(df, max_points)
+        self.dpi    = dpi
+
+    @staticmethod
+    def decimate(df, max_points):
+        """
+        Reduces a frame to about max_points rows, keeping the first/last rows, the
+        min/max close of each bucket and every trade row (markers stay exact)
+        """
+        if df is None or not max_points or len(df) <= max_points: return df
+        n      = len(df)
+        bucket = -(-2*n//max_points)
+        close  = df["Close"].to_numpy(dtype=float)
+        pad    = np.full(-(-n//bucket)*bucket, np.nan)
+        pad[:n] = close
+        blocks = pad.reshape(-1, bucket)
+        starts = np.arange(len(blocks))*bucket
+        keep   = [
+            starts +np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1),
+            starts +np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1),
+            [0, n -1],
+        ]
+        if "Trade" in df: keep.append(np.flatnonzero(df["Trade"].fillna(0).to_numpy() != 0))
+        rows = np.unique(np.concatenate(keep))
+        return df.iloc[rows[rows < n]]
                         
     def plot_price(self, axis, ticker):
         axis.plot(self.df.index, self.df["Close"], label="Price")
@@ -22,7 +49,7 @@ class Visualizer:
             axis.plot(self.df.index, self.df["Long"], label=f"{ind_t}{params[1]}")
         if "Long" in self.df and len(params) >= 3:
             axis.plot(self.df.index, self.df["Long"], label=f"{ind_t}{params[1]}")
-        if "Med" in self.df and len(params) >= 3:
+        if "Mid" in self.df and len(params) >= 3:
              axis.plot(self.df.index, self.df["Mid"], label=f"{ind_t}{params[2]}")
     
     def plot_bb(self, axis, params):
@@ -73,17 +100,17 @@ class Visualizer:
         axis_ret.legend()
         axis_ret.grid(True)
         plt.tight_layout()
-        plt.savefig(f"data/results/{label}_backtest.png", dpi=300, bbox_inches="tight")
+        plt.savefig(f"data/results/{label}_backtest.png", dpi=self.dpi, bbox_inches="tight")
         plt.close()               
         
     def plot_optimization(self, opt_global, opt_local, label):
         ticker, ind_t, *params = label.split("_")
-        k     = [d["k"] for d in opt_global]
-        score = [d["score"] for d in opt_global]
-        T     = [d.get("T") for d in opt_global]
-        alpha = [d.get("alpha") for d in opt_global]
+        k     = opt_global["k"]
+        score = opt_global["score"]
+        T     = opt_global["T"]
+        alpha = opt_global["alpha"]
         
-        n_params    = len(opt_global[0]["params"])
+        n_params    = opt_global["params"].shape[1]
         if n_params == 2:
             planes = [(0, 1)]
         else:
@@ -103,7 +130,7 @@ class Visualizer:
 
         # alpha evolution
         axes[1].plot(k, alpha, label=r"$\alpha$", color='tab:green')
-        if any(T_i is not None for T_i in T):
+        if not np.isnan(T).all():
             # temperature evolution
             axes[1].plot(k, T, label="T", color='tab:orange')
         axes[1].set_xlabel("Iteration")
@@ -113,8 +140,8 @@ class Visualizer:
         axes[1].grid(True)
 
         # heatmap
-        P           = list(zip(*[d["params"] for d in opt_local]))
-        score_local = [d["score"] for d in opt_local]
+        P           = opt_local["params"].T
+        score_local = opt_local["score"]
         axes_heat = []
         for idx, (i, j) in enumerate(planes):
             ax = fig.add_subplot(gs[1+idx//2, idx%2])
@@ -122,22 +149,21 @@ class Visualizer:
             
             p1 = P[i]
             p2 = P[j]
-            sc = ax.hexbin(p1, p2, C=score_local, gridsize=10, reduce_C_function=max, cmap="viridis")
+            sc = ax.hexbin(p1, p2, C=score_local, gridsize=10, reduce_C_function=np.max, cmap="viridis")
             ax.set_xlabel(f"x_{i+1}")
             ax.set_ylabel(f"x_{j+1}")
             ax.set_title(f"{ticker} - Score heatmap {ind_t} (x_{i+1}, x_{j+1})")
             
         plt.tight_layout(rect=[0, 0, 1, 0.96])
         fig.colorbar(sc, ax=axes_heat, fraction=0.03, pad=0.04, label="Score")
-        plt.savefig(f"data/results/{ticker}_{ind_t}_optimization.png", dpi=300)
+        plt.savefig(f"data/results/{ticker}_{ind_t}_optimization.png", dpi=self.dpi)
         plt.close()
         
         # optimization space
         if n_params == 2:
             fig, axis = plt.subplots(figsize=(12, 12))
-            p1    = [d["params"][0] for d in opt_local]
-            p2    = [d["params"][1] for d in opt_local]
-            sc    = axis.scatter(p1, p2, c=score_local, cmap="viridis")
+            p1, p2 = P
+            sc     = axis.scatter(p1, p2, c=score_local, cmap="viridis")
             
             axis.set_xlabel("x₁")
             axis.set_ylabel("x₂")
@@ -150,9 +176,7 @@ class Visualizer:
             ax3d = fig.add_subplot(111, projection="3d")
             ax3d.set_box_aspect((1, 1, 0.8))
             ax3d.view_init(elev=20, azim=45)
-            p1 = [d["params"][0] for d in opt_local]
-            p2 = [d["params"][1] for d in opt_local]
-            p3 = [d["params"][2] for d in opt_local]
+            p1, p2, p3 = P
             sc = ax3d.scatter(p1, p2, p3, c=score_local, cmap="viridis")
             
             ax3d.set_xlabel("x_1")
@@ -164,5 +188,72 @@ class Visualizer:
         else:
             fig = plt.figure(figsize=(20, 12))
                  
-        plt.savefig(f"data/results/{ticker}_{ind_t}_exploration.png", dpi=300)
-        plt.close()
\ No newline at end of file
+        plt.savefig(f"data/results/{ticker}_{ind_t}_exploration.png", dpi=self.dpi)
+        plt.close()
+
+
+def render_job(method, df, dpi, *args):
+    # render one chart (runs in a worker process)
+    getattr(Visualizer(df, dpi), method)(*args)
+
+
+# =====================================================
+#  Renderer
+# =====================================================
+class Renderer:
+    """
+    Plot rendering stage: charts are queued while the optimization runs and
+    rendered in a process pool (inline when workers is 0)
+    parameters (config "plot" section):
+    - top_n: backtest charts per ticker (best scores)
+    - dpi, preview_dpi: output resolution, preview_dpi is used when preview is set
+    - max_points: rows plotted per backtest chart (longer frames are decimated)
+    """
+    def __init__(self, file_config="config/config.json"):
+        self.load_config(file_config)
+        self.pool    = ProcessPoolExecutor(max_workers=self.workers) if self.enabled and self.workers > 0 else None
+        self.futures = []
+        self.errors  = []
+
+    def load_config(self, path):
+        plot_cfg = RunConfig.load(path).get("plot", {})
+        self.enabled    = plot_cfg.get("enabled", True)
+        self.top_n      = plot_cfg.get("top_n", 5)
+        self.workers    = plot_cfg.get("workers", 2)
+        self.max_points = plot_cfg.get("max_points", 2000)
+        self.dpi        = plot_cfg.get("preview_dpi", 72) if plot_cfg.get("preview", False) else plot_cfg.get("dpi", 300)
+
+    def submit(self, method, df, *args):
+        if not self.enabled: return
+        label = args[-1]
+        df    = Visualizer.decimate(df, self.max_points)   # decimate before sending to workers
+        if self.pool is not None:
+            self.futures.append((label, self.pool.submit(render_job, method, df, self.dpi, *args)))
+            return
+        try:
+            render_job(method, df, self.dpi, *args)
+        except Exception as err:
+            self.errors.append((label, err))
+
+    def plot_results(self, steps):
+        # backtest charts of the top_n steps (dicts with label, df and score)
+        for step in sorted(steps, key=lambda step: step["score"], reverse=True)[:self.top_n]:
+            self.submit("plot_results", step["df"], step["label"])
+
+    def plot_optimization(self, opt_global, opt_local, label):
+        if opt_global: self.submit("plot_optimization", None, opt_global, opt_local, label)
+
+    def close(self):
+        """
+        Waits for queued charts
+        returns:
+        - list of (label, error) of the charts that failed
+        """
+        for label, future in self.futures:
+            try:
+                future.result()
+            except Exception as err:
+                self.errors.append((label, err))
+        if self.pool is not None: self.pool.shutdown()
+        self.futures = []
+        return self.errors
@@ -0,0 +1,63 @@
+from .backtester import Backtester
+from .strategies import Strategies
+from .config import RunConfig
+from .optimizer import Optimizer
+
+
+# =====================================================
+#  Walk Forward
+# =====================================================
+class WalkForward:
+    """
+    Walk-forward optimization: each fold searches on a train window and reports
+    out-of-sample metrics of its best candidate on the following test window.
+    Indicators are computed once over the whole history and folds backtest slices of it.
+    parameters:
+    - train, test: window lengths (bars)
+    - step: bars between consecutive folds
+    """
+    def __init__(self, df, search_space, train, test, step, file_config="config/config.json", store=None, ticker=None):
+        self.df          = df
+        self.space       = search_space
+        self.train       = train
+        self.test        = test
+        self.step        = step
+        self.config      = RunConfig.load(file_config)
+        self.strategies  = Strategies(self.config)
+        self.store       = store
+        self.ticker      = ticker
+
+    @staticmethod
+    def n_folds(n_bars, train, test, step):
+        return max(0, (n_bars -train -test)//step +1)
+
+    def folds(self):
+        # (train, test) bar slices of every fold
+        return [
+            (slice(start, start +self.train), slice(start +self.train, start +self.train +self.test))
+            for start in range(0, self.step*self.n_folds(len(self.df), self.train, self.test, self.step), self.step)
+        ]
+
+    def run_fold(self, fold):
+        train, test  = self.folds()[fold]
+        optimization = Optimizer(self.df, self.space, self.config, store=self.store, ticker=self.ticker, bars=train)
+        best         = max(optimization.search(), key=lambda step: step["score"])
+
+        # out-of-sample backtest of the best in-sample candidate
+        ind_t, ind_p = best["indicator"]["ind_t"], best["indicator"]["ind_p"]
+        _, batch     = Backtester.run_batch(self.df["Close"], self.df["Volume"], ind_t, [ind_p], optimization.store, self.ticker, test, full=False)
+        metrics      = {name: values[0] for name, values in batch.items()}
+        index        = self.df.index
+        return {
+            "Fold": fold,
+            "Train_Start": index[train][0],
+            "Train_End": index[train][-1],
+            "Test_Start": index[test][0],
+            "Test_End": index[test][-1],
+            "Indicator": ind_t,
+            "Parameters": ind_p,
+            "Score_In": best["score"],
+            "Score_Out": self.strategies.compute_score(metrics),
+            **{f"{name}_In": value for name, value in best["metrics"].items()},
+            **{f"{name}_Out": value for name, value in metrics.items()},
+        }
@@ -52,7 +52,7 @@ class Gui(App):
         col.add_widget(Label(text=section.upper(), size_hint_y=None, height=30, bold=True))
         
         # checkbox fields
-        if section in {"simulated_annealing", "genetic_algorithm", "grid_search"}:
+        if section in {"simulated_annealing", "genetic_algorithm", "grid_search", "bayesian_optimization", "successive_halving", "walk_forward", "panel", "plot", "profile"}:
             row = BoxLayout(size_hint_y=None, height=30, spacing=5)
             lbl = Label(text="enabled", size_hint_x=0.7)
             lbl.bind(size=lbl.setter("text_size"))
@@ -69,7 +69,17 @@ class Gui(App):
             # jump enabled
             if key == "enabled": continue
             
-            if isinstance(value, (int, float)):
+            if isinstance(value, bool):
+                row = BoxLayout(size_hint_y=None, height=30, spacing=5)
+                lbl = Label(text=key, size_hint_x=0.7, halign="left", valign="middle")
+                lbl.bind(size=lbl.setter("text_size"))
+                chk = CheckBox(active=value, size_hint=(None, None), size=(40, 40), opacity=1)
+
+                row.add_widget(lbl)
+                row.add_widget(chk)
+                col.add_widget(row)
+                self.inputs[f"{section}.{key}"] = chk
+            elif isinstance(value, (int, float)):
                 row = BoxLayout(size_hint_y=None, height=30, spacing=5)
                 lbl = Label(text=key, size_hint_x=0.7, halign="left", valign="middle")
                 lbl.bind(size=lbl.setter("text_size"))
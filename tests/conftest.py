@@ -0,0 +1,33 @@
+import os, json
+import pytest
+from benchmarks.synthetic import synthetic_ohlcv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # runs the test inside a temporary folder (traces, checkpoints and stores are written there)
+    os.makedirs(tmp_path/"data"/"results")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def make_config(workdir):
+    # repo config with searches disabled, updated with the given sections
+    def make(**override):
+        with open(os.path.join(ROOT, "config", "config.json"), "r", encoding="utf-8") as f: config = json.load(f)
+        config.update({"result_store": "", "checkpoint_every": 0, "lean": True, "sweep": False})
+        for name in ["simulated_annealing", "hill_climbing", "genetic_algorithm", "grid_search", "bayesian_optimization", "successive_halving"]:
+            config[name] = {**config.get(name, {}), "enabled": False}
+        config.update(override)
+        path = str(workdir/"config.json")
+        with open(path, "w", encoding="utf-8") as f: json.dump(config, f)
+        return path
+    return make
+
+
+@pytest.fixture
+def prices():
+    return synthetic_ohlcv(400, seed=1)
@@ -0,0 +1,48 @@
+import itertools, tracemalloc
+import numpy as np
+import pytest
+from benchmarks.synthetic import synthetic_ohlcv
+from core.backtester import Backtester
+from core.indicator import Indicator
+
+
+@pytest.mark.parametrize("bars", [None, slice(100, 300)])
+def test_metrics_only_batch_matches_full_batch(prices, bars):
+    params = [list(p) for p in itertools.product(range(2, 30, 4), range(5, 60, 9), range(10, 90, 13))]
+    _, full = Backtester.run_batch(prices["Close"], prices["Volume"], "SMA", params, bars=bars)
+    arrays, lean = Backtester.run_batch(prices["Close"], prices["Volume"], "SMA", params, bars=bars, full=False, max_bytes=400*8*Backtester.ARRAYS*7)
+    assert arrays == {}
+    for name in full:
+        assert np.array_equal(full[name], lean[name], equal_nan=True), name
+
+
+@pytest.mark.parametrize("ind_t, params", [
+    ("SMA", [[5, 30, 60], [9, 21, 90], [3, 40, 41]]),
+    ("EMA", [[12, 26], [5, 50]]),
+    ("WMA", [[7], [20]]),
+    ("BB", [[20, 2], [10, 1]]),
+    ("MACD", [[12, 26, 9], [5, 35, 5]]),
+])
+def test_batch_metrics_match_run_strategy(prices, ind_t, params):
+    _, batch = Backtester.run_batch(prices["Close"], prices["Volume"], ind_t, params, full=False)
+    for i, ind_p in enumerate(params):
+        indicator = {"ind_t": ind_t, "ind_p": ind_p}
+        df = Backtester(Indicator(indicator).setup_indicator(prices)).run_strategy(indicator)
+        assert batch["Return_Market"][i] == df["Cumulative_Market"].iloc[-1]
+        assert batch["Return_Strategy"][i] == df["Cumulative_Strategy"].iloc[-1]
+        assert batch["Trades"][i] == df["Cumulative_Trades"].iloc[-1]
+        assert batch["Sharpe"][i] == df["Strategy"].mean()/df["Strategy"].std()*pow(len(df), 0.5)
+        assert batch["Max_Drawdown"][i] == abs(df["Drawdown"].min())
+
+
+@pytest.mark.parametrize("bars", [None, slice(9000, 10000)])
+def test_chunked_batch_stays_within_max_bytes(bars):
+    df     = synthetic_ohlcv(10000, seed=2)
+    params = np.column_stack([np.arange(2, 302) % 30 +2, np.arange(300) % 50 +30, np.arange(300) % 120 +80])
+    tracemalloc.start()
+    try:
+        Backtester.run_batch(df["Close"].to_numpy(), df["Volume"].to_numpy(), "SMA", params, bars=bars, full=False, max_bytes=4*1024**2)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 4*1024**2
@@ -0,0 +1,32 @@
+import os
+from core.checkpoint import Checkpoint
+from core.optimizer import Optimizer
+
+SPACE = {"ind_t": "SMA", "params": [{"min": 5, "max": 60}, {"min": 30, "max": 120}]}
+
+
+def test_log_appends_and_ignores_unsaved_records(workdir):
+    checkpoints = Checkpoint()
+    checkpoints.save("run", {"k": 1}, [{"a": 1}], append=False)
+    checkpoints.save("run", {"k": 2}, [{"a": 2}, {"a": 3}])
+    size = os.path.getsize(checkpoints.log_path("run"))
+    with open(checkpoints.log_path("run"), "ab") as f: f.write(b"partial write")    # crash before the state
+    saved = checkpoints.load("run")
+    assert saved["k"] == 2 and saved["data"] == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert os.path.getsize(checkpoints.log_path("run")) == size
+
+
+def test_grid_search_checkpoints_every_n_chunks(make_config, prices):
+    config = make_config(checkpoint_every=4, grid_search={"enabled": True, "alpha": 5, "batch_size": 10})
+    optimization = Optimizer(prices, SPACE, config, ticker="T")
+    saves = []
+    save  = Checkpoint.save
+    Checkpoint.save = lambda self, name, state, records=(), append=True: (saves.append(len(records)), save(self, name, state, records, append))
+    try:
+        optimization.search()
+    finally:
+        Checkpoint.save = save
+    chunks = -(-len(optimization.data)//10)
+    assert len(saves) == chunks//4 +1             # every 4 chunks, plus the end of the algorithm
+    assert sum(saves) == len(optimization.data)   # each step written once
+    assert Checkpoint().load(optimization.run_name())["data"] == [{**step, "df": None} for step in optimization.data]
@@ -0,0 +1,10 @@
+import os
+from core.exporter import Exporter
+
+
+def test_export_replaces_frames_of_previous_run(make_config, workdir, prices):
+    exporter = Exporter(make_config(export={"format": "npy"}))
+    exporter.export_dataframe({"T": {"SMA_5_30": prices, "SMA_7_40": prices}}, folder=str(workdir/"debug"))
+    exporter.export_dataframe({"T": {"SMA_9_50": prices}}, folder=str(workdir/"debug"))
+    assert sorted(os.listdir(workdir/"debug"/"T")) == ["SMA_9_50.npy"]
+    assert list(exporter.load_frames("T", str(workdir/"debug"))) == ["SMA_9_50"]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator import Indicator
+
+
+@pytest.mark.parametrize("kind", ["sma", "wma", "rolling_std"])
+def test_sweep_window_longer_than_series_with_gaps(kind):
+    x = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, 6.0])
+    out = Indicator.sweep(x, [2, 6, 7, 10], kind)
+    assert out.shape == (6, 4)
+    assert np.isnan(out[:, 2:]).all()
+    assert np.isnan(out[:, 1]).all()        # every 6-bar window contains the gap
+    assert np.isclose(out[5, 0], {"sma": 5.5, "wma": (5 +2*6)/3, "rolling_std": np.std([5, 6], ddof=1)}[kind])
+
+
+def test_wma_short_gappy_series():
+    x = pd.Series([1.0, np.nan, 3.0])
+    assert Indicator.wma(x, 5).isna().all()
+
+
+@pytest.mark.parametrize("gap", [False, True])
+def test_ema_sweep_equals_pandas_ewm(prices, gap):
+    x = prices["Close"].copy()
+    if gap: x.iloc[50:53] = np.nan
+    windows = [2, 9, 26, 90]
+    out = Indicator.sweep(x, windows, "ema")
+    for i, w in enumerate(windows):
+        assert np.array_equal(out[:, i], Indicator.ema(x, w).to_numpy(), equal_nan=True)
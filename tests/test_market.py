@@ -0,0 +1,40 @@
+import pandas as pd
+from benchmarks.synthetic import synthetic_ohlcv
+from core.loader import Loader
+
+
+class FrameSource:
+    # source serving slices of a dataframe (replaceable to simulate a re-adjusted history)
+    def __init__(self, df):
+        self.df    = df
+        self.calls = []
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((start, end))
+        return self.df.loc[(self.df.index >= start) & (self.df.index < end)]
+
+
+def loader(make_config, workdir, source, end):
+    config = make_config(start="2000-01-03", end=str(end.date()), market_store=str(workdir/"market"))
+    return Loader(config, source=source, clear=False)
+
+
+def test_incremental_refresh_appends_new_bars(make_config, workdir):
+    full   = synthetic_ohlcv(300, seed=4)
+    source = FrameSource(full)
+    loader(make_config, workdir, source, full.index[200]).download_data("T")
+    df = loader(make_config, workdir, source, full.index[-1] +pd.Timedelta(days=1)).download_data("T")
+    assert df.equals(full.loc[df.index]) and len(df) == 300
+    assert source.calls[-1][0] == full.index[198]      # only the missing range (one bar of overlap)
+
+
+def test_rescaled_history_is_refetched(make_config, workdir):
+    full   = synthetic_ohlcv(300, seed=4)
+    source = FrameSource(full)
+    loader(make_config, workdir, source, full.index[200]).download_data("T")
+
+    # dividend: every past adjusted price is rescaled
+    source.df = full.assign(Close=full["Close"]*0.97)
+    df = loader(make_config, workdir, source, full.index[-1] +pd.Timedelta(days=1)).download_data("T")
+    assert df["Close"].equals(source.df["Close"])
+    assert Loader(make_config(market_store=str(workdir/"market")), source=source, clear=False).store.load("T")["Close"].equals(source.df["Close"])
@@ -0,0 +1,41 @@
+import random
+import numpy as np
+from core.backtester import Backtester
+from core.indicator import Indicator, IndicatorStore
+from core.optimizer import Optimizer
+
+SPACE = {"ind_t": "SMA", "params": [{"min": 5, "max": 60}, {"min": 30, "max": 120}, {"min": 60, "max": 200}]}
+
+
+def test_successive_halving_traces_full_history_scores_only(make_config, prices):
+    config = make_config(successive_halving={"enabled": True, "n": 27, "eta": 3, "rungs": 3})
+    optimization = Optimizer(prices, SPACE, config, ticker="T")
+    optimization.search()
+    local = optimization.opt_local
+    assert 0 < len(local) <= 3
+    for params, score in zip(local["params"], local["score"]):
+        assert np.isclose(score, optimization.evaluate({"ind_t": "SMA", "ind_p": list(params)})[0], equal_nan=True)
+
+
+def test_folds_sharing_a_store_sweep_once(make_config, prices, monkeypatch):
+    config = make_config(sweep=True)
+    store  = IndicatorStore()
+    calls  = []
+    sweep  = Indicator.sweep
+    monkeypatch.setattr(Indicator, "sweep", staticmethod(lambda series, windows, kind, *args: (calls.append(kind), sweep(series, windows, kind, *args))[1]))
+    for start in range(0, 300, 100):
+        Optimizer(prices, SPACE, config, store=store, ticker="T", bars=slice(start, start +100)).prepare_sweep()
+    assert calls == ["sma"]
+
+
+def test_chains_reuse_stored_evaluations(make_config, prices, workdir, monkeypatch):
+    config = make_config(result_store=str(workdir/"evaluations.sqlite"), hill_climbing={"enabled": True, "chains": 2, "workers": 2, "k_max": 5})
+    random.seed(0)
+    first = Optimizer(prices, SPACE, config, ticker="T").search()
+
+    # same chains again: every candidate is stored, nothing is backtested
+    def backtest(*args, **kwargs): raise AssertionError("stored candidate backtested again")
+    monkeypatch.setattr(Backtester, "run_batch", staticmethod(backtest))
+    random.seed(0)
+    again = Optimizer(prices, SPACE, config, ticker="T").search()
+    assert {tuple(s["indicator"]["ind_p"]): s["score"] for s in again} == {tuple(s["indicator"]["ind_p"]): s["score"] for s in first}
@@ -0,0 +1,55 @@
+from core.optimizer import Optimizer
+from core.results import ResultStore
+
+SPACE = {"ind_t": "SMA", "params": [{"min": 5, "max": 20}, {"min": 30, "max": 60}]}
+
+
+def grid(path):
+    return {"result_store": path, "grid_search": {"enabled": True, "alpha": 5, "batch_size": 64}}
+
+
+def test_folds_never_share_stored_results(make_config, prices, workdir):
+    config = make_config(**grid(str(workdir/"evaluations.sqlite")))
+    Optimizer(prices, SPACE, config, ticker="T", bars=slice(0, 200)).search()
+
+    # another window of the same data: nothing stored for it yet
+    fold = Optimizer(prices, SPACE, config, ticker="T", bars=slice(100, 300))
+    fold.search()
+    assert fold.stored == {}
+    fresh = Optimizer(prices, SPACE, make_config(**grid("")), ticker="T", bars=slice(100, 300))
+    fresh.search()
+    assert {tuple(s["indicator"]["ind_p"]): s["score"] for s in fold.data} == {tuple(s["indicator"]["ind_p"]): s["score"] for s in fresh.data}
+
+
+def test_stored_results_reused_for_same_window(make_config, prices, workdir):
+    config = make_config(**grid(str(workdir/"evaluations.sqlite")))
+    Optimizer(prices, SPACE, config, ticker="T", bars=slice(100, 300)).search()
+    again = Optimizer(prices, SPACE, config, ticker="T", bars=slice(100, 300))
+    again.search()
+    assert len(again.stored) == len(again.data) > 0
+    assert len(Optimizer(prices, SPACE, config, ticker="T", bars=slice(0, 200)).search()) > 0
+
+
+def test_load_filters_on_window(workdir):
+    store   = ResultStore(str(workdir/"evaluations.sqlite"))
+    metrics = {m: 1.0 for m in ResultStore.METRICS}
+    store.add("T", "fp", "SMA", [5], 1, metrics, "2000-01-03", "2000-06-01")
+    assert store.load("T", "fp", "SMA", 1, "2000-01-03", "2000-06-01") == {(5,): {**metrics, "Trades": 1}}
+    assert store.load("T", "fp", "SMA", 1, "2000-02-01", "2000-06-01") == {}
+    store.close()
+
+
+def test_res_data_returns_every_fold_of_latest_data(workdir):
+    store   = ResultStore(str(workdir/"evaluations.sqlite"))
+    metrics = {m: 1.0 for m in ResultStore.METRICS}
+    old, new = "a"*ResultStore.DIGEST, "b"*ResultStore.DIGEST
+    for i in range(3): store.add("T", old, "SMA", [i], 1, metrics)
+    for fold in ["_0_100", "_100_200"]:
+        for i in range(3): store.add("T", new +fold, "SMA", [i], 1, metrics)
+    store.add("U", old, "SMA", [7], 1, metrics)
+    store.flush()
+    store.conn.execute("UPDATE evaluations SET created = created -1 WHERE fingerprint = ?", (old,))
+    res_data = store.res_data()
+    assert sorted(res_data["T"]) == sorted(f"T_SMA_{i}{fold}" for i in range(3) for fold in ["_0_100", "_100_200"])
+    assert list(res_data["U"]) == ["U_SMA_7"]
+    store.close()
@@ -0,0 +1,17 @@
+from benchmarks.synthetic import synthetic_ohlcv
+from core.runner import optimize_job
+
+SPACE = {"ind_t": "SMA", "params": [{"min": 5, "max": 20}, {"min": 30, "max": 60}]}
+
+
+def scores(result):
+    return {tuple(s["indicator"]["ind_p"]): s["score"] for s in result["steps"]}
+
+
+def test_same_ticker_new_data_recomputes_indicators(make_config):
+    config = make_config(grid_search={"enabled": True, "alpha": 5, "batch_size": 64})
+    first  = synthetic_ohlcv(300, seed=1)
+    second = synthetic_ohlcv(300, seed=2)
+    optimize_job("T", first, SPACE, config)
+    assert scores(optimize_job("T", second, SPACE, config)) == scores(optimize_job("U", second, SPACE, config))
+    optimize_job("T", synthetic_ohlcv(250, seed=3), SPACE, config)     # other length, no shape mismatch
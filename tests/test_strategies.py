@@ -0,0 +1,25 @@
+import numpy as np
+from core.results import ResultStore
+from core.strategies import Strategies
+
+
+def test_rankings_agree_with_compute_score(make_config, workdir):
+    rng     = np.random.default_rng(0)
+    store   = ResultStore(str(workdir/"evaluations.sqlite"))
+    for i in range(2000):
+        metrics = {"Return_Market": 1.1, "Return_Strategy": rng.uniform(0.5, 2), "Trades": int(rng.integers(0, 40)), "Sharpe": rng.normal(), "Max_Drawdown": rng.uniform(0, 0.6)}
+        store.add("T", "a"*ResultStore.DIGEST, "SMA", [i % 50, i//50], 1, metrics)
+    strategies  = Strategies(make_config(preset="custom", weights={"w_return": 1.0, "w_trades": 0.01, "w_sharpe": 0.3, "w_drdown": 0.2}))
+    weight_sets = {**strategies.preset_weights(), "vector": (0.5, 0.02, 0.1, 0.4)}
+    rankings    = strategies.rescore_all(store, weight_sets=weight_sets)
+    res_data    = store.res_data()["T"]
+    store.close()
+
+    for name, weights in weight_sets.items():
+        weights  = weights if isinstance(weights, dict) else dict(zip(Strategies.WEIGHTS, weights))
+        expected = {label: strategies.compute_score(metrics, **weights) for label, metrics in res_data.items()}
+        ranking  = rankings[name]["T"]
+        assert np.allclose(ranking["Score"], [expected[label] for label in ranking.index], rtol=1e-12, atol=0)
+        assert (np.diff(ranking["Score"]) <= 0).all() and len(ranking) == len(res_data)
+        scores = strategies.score_matrix(ranking, {name: weight_sets[name]})[name]
+        assert np.allclose(scores, ranking["Score"], rtol=1e-12, atol=0)
@@ -0,0 +1,48 @@
+import pickle
+import numpy as np
+import pytest
+from core.backtester import Backtester
+from core.optimizer import Optimizer
+from core.results import ResultStore
+from core.streaming import IncrementalBacktest
+
+SPACE = {"ind_t": "SMA", "params": [{"min": 5, "max": 60}, {"min": 30, "max": 120}]}
+
+
+def assert_metrics_equal(metrics, expected):
+    for name in expected:
+        if name == "Sharpe": assert np.allclose(metrics[name], expected[name], rtol=1e-12), name      # Welford vs two-pass
+        else:                assert np.array_equal(metrics[name], expected[name]), name
+
+
+@pytest.mark.parametrize("ind_t, params", [
+    ("SMA", [[5, 30, 60], [9, 21, 90], [3, 40, 41]]),
+    ("EMA", [[12, 26], [5, 50]]),
+    ("WMA", [[7], [20]]),
+    ("BB", [[20, 2], [10, 1]]),
+    ("MACD", [[12, 26, 9], [5, 35, 5]]),
+])
+def test_split_advance_matches_run_batch(prices, ind_t, params):
+    close, volume = prices["Close"].to_numpy(), prices["Volume"].to_numpy()
+    stream = IncrementalBacktest.from_history(close[:250], volume[:250], ind_t, params[:1])
+    stream = stream.merge(IncrementalBacktest.from_history(close[:250], volume[:250], ind_t, params[1:]))
+    stream = pickle.loads(pickle.dumps(stream)).advance(close[250:251]).advance(close[251:])
+    _, expected = Backtester.run_batch(close, volume, ind_t, params)
+    assert_metrics_equal(stream.metrics(), expected)
+    assert_metrics_equal(IncrementalBacktest(ind_t, params).advance(close).metrics(), expected)
+
+
+def test_next_run_advances_stored_stream(make_config, prices):
+    config = make_config(result_store="data/results.sqlite", streaming={"enabled": True}, grid_search={"enabled": True, "alpha": 5, "batch_size": 10})
+    first  = Optimizer(prices.iloc[:300], SPACE, config, ticker="T")
+    first.search()
+    params = [step["indicator"]["ind_p"] for step in first.data]
+
+    # next day: every candidate of the previous run is known before the search
+    second = Optimizer(prices, SPACE, config, ticker="T")
+    second.fingerprint = ResultStore.fingerprint(prices)
+    second.open_results()
+    assert second.stream.n == len(prices) and len(second.stored) == len(params)
+    _, expected = Backtester.run_batch(prices["Close"], prices["Volume"], "SMA", params)
+    assert_metrics_equal({name: np.array([second.stored[tuple(p)][name] for p in params]) for name in expected}, expected)
+    second.results.close()
@@ -0,0 +1,17 @@
+import numpy as np
+from core.surrogate import GaussianProcess
+
+
+def test_add_matches_refit_with_fixed_hyperparameters():
+    rng  = np.random.default_rng(0)
+    X    = rng.random((40, 3))
+    y    = np.sin(4*X).sum(axis=1)
+    gp   = GaussianProcess().fit(X[:30], y[:30])
+    for x, v in zip(X[30:], y[30:]): gp.add(x, v)
+
+    K    = GaussianProcess.kernel(X, X, gp.scale) +gp.noise*np.eye(len(X))
+    L    = np.linalg.cholesky(K)
+    assert np.allclose(gp.L, L)
+    assert np.allclose(gp.alpha, np.linalg.solve(K, (y -gp.mean)/gp.std))
+    mu, sigma = gp.predict(X[30:])
+    assert np.allclose(mu, y[30:], atol=1e-2) and (sigma < 0.05*gp.std).all()
@@ -1,48 +1,124 @@
-import os, traceback, itertools
+import os, sys, json, traceback, itertools
+from collections import Counter
 from core.loader import Loader
+from core.runner import Runner, optimize_job, walk_forward_job, panel_job
+from core.panel import Panel
+from core.walkforward import WalkForward
 from core.strategies import Strategies
 from core.optimizer import Optimizer
-from core.visualizer import Visualizer
+from core.visualizer import Renderer
 from core.exporter import Exporter
+from core.checkpoint import Checkpoint
+from core.profiler import PROFILER, Profiler
+from core.prices import PriceRegistry
+from core.config import RunConfig
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 
-def run_tso(on_log=None):
+def run_tso(on_log=None, resume=False):
         
     def log(msg):
         if on_log: on_log(msg)
         else: print(msg)
         
-    # import configuration files
-    loader       = Loader("config/config.json", "config/tickers.json")
+    # import configuration files (config.json is read once, edits take effect on the next run)
+    config       = RunConfig.load("config/config.json")
+    loader       = Loader(config, "config/tickers.json", clear=not resume)
     tickers      = loader.load_tickers()
     search_space = loader.load_search_space()
-    flag_plot    = True
+    PROFILER.load_config(config)
+    PROFILER.reset()
     
     # initialize cache dictionaries
     raw_data = {}
     pro_data = {}
     res_data = {}
+    profiles = {}
+    opt_data = {}
+    prices   = PriceRegistry()     # price data shared with the jobs (memory-mapped, not pickled)
     
     try:
-        # download data and run optimization (for each ticker and indicator)
-        for ticker, indicators_space in itertools.product(tickers, search_space):
-
-            # download data (only once)
-            if ticker not in raw_data:
+        # download data (only once for each ticker)
+        for ticker in tickers:
+            try:
                 log(f"Downloading data for {ticker}.")
-                raw_data[ticker] = loader.download_data(ticker)
-            df = raw_data[ticker].copy()
+                with PROFILER.stage("download"): raw_data[ticker] = loader.download_data(ticker)
+                prices.add(ticker, raw_data[ticker])
+            except Exception as err:
+                log(f"Skipping {ticker}, download failed: {err}.")
+        
+        # walk-forward mode: out-of-sample metrics for each fold (folds run in parallel if workers > 1)
+        if loader.wf_cfg.get("enabled"):
+            wf_cfg = loader.wf_cfg
+            jobs   = [
+                (ticker, prices[ticker], indicators_space, fold, wf_cfg, config)
+                for ticker, indicators_space in itertools.product(tickers, search_space) if ticker in raw_data
+                for fold in range(WalkForward.n_folds(len(raw_data[ticker]), wf_cfg["train"], wf_cfg["test"], wf_cfg["step"]))
+            ]
+            log(f"Walk-forward: {len(jobs)} folds with {loader.workers} worker(s).")
             
-            # run optimization
-            log(f"Optimizing for {ticker}.")
-            optimization = Optimizer(df, indicators_space)
-            step_data    = optimization.search()
+            wf_data = {}
+            for (ticker, _, indicators_space, fold, *_), result, err in Runner(loader.workers).run(walk_forward_job, jobs):
+                if err is not None:
+                    log(f"Walk-forward fold {fold} failed for {ticker} ({indicators_space['ind_t']}): {err}.")
+                    continue
+                log(f"{ticker} fold {fold}: score in-sample {result['Score_In']:.4f} | out-of-sample {result['Score_Out']:.4f}")
+                wf_data.setdefault(ticker, []).append(result)
+            Exporter(config).export_walk_forward(wf_data)
+            return
+        
+        # panel mode: one parameter set for the whole universe (indicator spaces run in parallel if workers > 1)
+        if loader.panel_cfg.get("enabled"):
+            panel = Panel(raw_data)
+            jobs  = [(panel, indicators_space, config, resume) for indicators_space in search_space]
+            log(f"Panel: {len(panel.tickers)} tickers, {panel.n_bars} dates, {len(jobs)} jobs with {loader.workers} worker(s).")
+            
+            panel_data = {}
+            for (_, indicators_space, *_), ranking, err in Runner(loader.workers).run(panel_job, jobs):
+                label = f"{indicators_space['ind_t']}{len(indicators_space['params'])}"
+                if err is not None:
+                    log(f"Panel optimization failed for {label}: {err}.")
+                    continue
+                best = ranking.iloc[0]
+                log(f"Panel {label}: best {best['Parameters']} | score {best['Score']:.4f}")
+                panel_data[label] = ranking
+            Exporter(config).export_panel(panel_data)
+            Checkpoint().clear()
+            return
+        
+        # run optimization (for each ticker and indicator, in parallel if workers > 1)
+        jobs = [(ticker, prices[ticker], indicators_space, config, resume) for ticker, indicators_space in itertools.product(tickers, search_space) if ticker in raw_data]
+        log(f"Optimizing {len(jobs)} jobs with {loader.workers} worker(s).")
+        
+        # charts are rendered in background while the optimization runs
+        renderer  = Renderer(config)
+        remaining = Counter(job[0] for job in jobs)
+        plot_data = {}
+        
+        for (ticker, _, indicators_space, *_), result, err in Runner(loader.workers).run(optimize_job, jobs):
+            remaining[ticker] -= 1
+            if err is not None:
+                log(f"Optimization failed for {ticker} ({indicators_space['ind_t']}): {err}.")
+                if remaining[ticker] == 0: renderer.plot_results(plot_data.pop(ticker, []))
+                continue
+            log(f"Optimized {ticker} ({indicators_space['ind_t']}).")
+            Profiler.merge(profiles.setdefault(ticker, Profiler.empty()), result["profile"])
+            
+            # restore compact results of the job
+            optimization = Optimizer(raw_data[ticker], indicators_space, config, ticker=ticker)
+            optimization.data       = result["steps"]
+            optimization.opt_global = result["opt_global"]
+            optimization.opt_local  = result["opt_local"]
+            opt_data[f"{ticker}_{indicators_space['ind_t']}{len(indicators_space['params'])}"] = {"opt_global": optimization.opt_global, "opt_local": optimization.opt_local}
+            step_data               = optimization.data
             
             if ticker not in res_data:
                 res_data[ticker] = {}
                 pro_data[ticker] = {}
 
+            # rebuild dataframes only for steps to be plotted or exported
+            with PROFILER.stage("materialize"): optimization.best()
+
             # visualize results
             for step in step_data:
                 
@@ -52,50 +128,80 @@ def run_tso(on_log=None):
                 ind_p  = indicator["ind_p"]  # indicator parameters
                 params = "_".join(str(p) for p in ind_p)
                 label  = f"{ticker}_{ind_t}_{params}"
-                pro_data[ticker][label] = df.copy()
                 res_data[ticker][label] = {
                     "Indicator": ind_t,
                     "Parameters": ind_p,
                     **metrics
                 }
-                
-                visualizer = Visualizer(df)
-                if flag_plot:
-                    visualizer.plot_results(label)
+                if df is None: continue
+                pro_data[ticker][label] = df.copy()
+                plot_data.setdefault(ticker, []).append({"label": label, "df": df, "score": step["score"]})
+            
+            with PROFILER.stage("plotting"):
+                renderer.plot_optimization(optimization.opt_global, optimization.opt_local, f"{ticker}_{indicators_space['ind_t']}")
             
-            visualizer.plot_optimization(optimization.opt_global, optimization.opt_local, label)
+                # backtest charts of the top_n steps, once every job of the ticker is done
+                if remaining[ticker] == 0: renderer.plot_results(plot_data.pop(ticker, []))
 
 
         # compute best strategies (for each ticker)
         log("Consolidating results.")
-        bst_data = Strategies().best_strategy(res_data)
+        with PROFILER.stage("consolidation"):
+            strategies = Strategies(config)
+            bst_data   = strategies.best_strategy(res_data)
+            rankings   = strategies.rank_all(res_data)       # every preset, for weight sensitivity
 
-        # export dataframe for analysis
-        exporter = Exporter()
-        exporter.export_dataframe(pro_data)
-        
-        # export backtesting results (sorted by best)
-        exporter.export_best_results(bst_data)
+        with PROFILER.stage("export"):
+            # export dataframe for analysis
+            exporter = Exporter(config)
+            exporter.export_dataframe(pro_data, bst_data)
+            
+            # export backtesting results (sorted by best)
+            exporter.export_best_results(bst_data)
 
-        # update best strategies
-        exporter.update_best_results(bst_data)
+            # update best strategies
+            exporter.update_best_results(bst_data)
+            
+            # export best strategies under every preset
+            exporter.export_presets(rankings)
+            
+            # export optimization traces
+            exporter.export_traces(opt_data)
+        
+        # wait for the charts
+        with PROFILER.stage("plotting"): plot_errors = renderer.close()
+        for label, err in plot_errors:
+            log(f"Plot failed for {label}: {err}.")
+        
+        # profile summary (stages of this process and of every job)
+        if PROFILER.enabled:
+            summary = PROFILER.summary(profiles)
+            for line in Profiler.report(summary): log(line)
+            with open("data/results/profile.json", "w", encoding="utf-8") as f: json.dump(summary, f, indent=4)
+        
+        # run completed, checkpoints are no longer needed
+        Checkpoint().clear()
         
     except Exception as err:
         tb = traceback.format_exc()
         log(f"Error in main: {err}\n{tb}.")
         raise
     
-def main():
-    run_tso() 
+    finally:
+        prices.close()
+    
+def main(resume=False):
+    run_tso(resume=resume) 
 
 
 if __name__ == "__main__":
     max_attempt = 3
+    resume      = "--resume" in sys.argv
     
     for attempt in range(1, max_attempt +1):
         try:
             print(f"Attempt {attempt} of {max_attempt}.")
-            main()
+            main(resume=resume or attempt > 1)   # retries continue from the last checkpoint
             break
         
         except Exception as err: